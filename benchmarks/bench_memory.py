@@ -0,0 +1,127 @@
+"""
+Peak RSS and time for static review of huge and minified files.
+
+Each case runs in a fresh child process so ru_maxrss reflects only that
+case. "plain" reads the whole file and runs every checker uncapped;
+"guarded" uses the streaming reader and per-rule caps from run.py.
+
+Usage:
+    python benchmarks/bench_memory.py [--lines N] [--minified-bytes N]
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+OLD_MULTI_VAR_PATTERN = re.compile(r'\b(int|double|float|String|boolean|char)\s+\w+.*(,).*(?=;)')
+PREVIOUS_MULTI_VAR_PATTERN = re.compile(r'\b(int|double|float|String|boolean|char)\s+\w+[^,;]*(,)')
+
+
+def write_fixtures(directory: str, lines: int, minified_bytes: int) -> dict:
+    generated = os.path.join(directory, "Generated.java")
+    with open(generated, "w") as f:
+        f.write("public class Generated {\n")
+        for i in range(lines):
+            f.write(f"    private static final int value_{i}=foo({i},{i + 1});   \n")
+        f.write("}\n")
+
+    minified = os.path.join(directory, "Minified.java")
+    with open(minified, "w") as f:
+        f.write("class M{")
+        chunk = "int a=1,b=2;if(a>b){a=b;}"
+        f.write(chunk * (minified_bytes // len(chunk)))
+        f.write("}\n")
+
+    return {"generated": generated, "minified": minified}
+
+
+def run_child(mode: str, path: str):
+    from src.analysis.guard import load_guard_limits_from_env, read_source_guarded
+    from src.reviewer.pipeline import STATIC_RULES_PATH, run_static_checks
+    from src.rules.rule_loader import load_rules
+
+    rules = load_rules(STATIC_RULES_PATH)
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    if mode == "guarded":
+        limits = load_guard_limits_from_env()
+        code = read_source_guarded(path, limits).code
+        comments = run_static_checks(path, code, rules, limits.max_findings_per_rule)
+    else:
+        with open(path, "r") as f:
+            code = f.read()
+        comments = run_static_checks(path, code, rules)
+
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_kb": peak_rss,
+        "delta_rss_kb": peak_rss - start_rss,
+        "findings": len(comments),
+    }))
+
+
+def bench_regex(label: str, line: str):
+    from src.analysis.static_checks import check_multiple_var_declaration
+    from src.reviewer.models import Severity
+    from src.rules.rule_definitions import Rule
+
+    rule = Rule("JAVA_MULTIPLE_VAR_DECL", "", "variable", Severity.MINOR, "")
+    for name, fn in (
+        ("old .*(,).*(?=;)", lambda: OLD_MULTI_VAR_PATTERN.search(line)),
+        ("previous [^,;]*", lambda: PREVIOUS_MULTI_VAR_PATTERN.search(line, 0, line.rfind(";"))),
+        ("new checker", lambda: check_multiple_var_declaration("Bench.java", line, rule)),
+    ):
+        start = time.perf_counter()
+        fn()
+        print(f"  {name:<18} {label}: {time.perf_counter() - start:.4f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--minified-bytes", type=int, default=5_000_000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    env = dict(os.environ, ACTION_ROOT=os.environ.get("ACTION_ROOT", ROOT))
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures = write_fixtures(directory, args.lines, args.minified_bytes)
+        print(f"{'case':<10} {'mode':<8} {'time':>9} {'peak RSS':>11} {'delta RSS':>11} {'findings':>9}")
+        for case, path in fixtures.items():
+            for mode in ("plain", "guarded"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, path],
+                    capture_output=True, text=True, check=True, env=env,
+                ).stdout.strip().splitlines()[-1]
+                r = json.loads(output)
+                print(
+                    f"{case:<10} {mode:<8} {r['seconds']:>8.2f}s {r['peak_rss_kb'] / 1024:>9.1f}MB "
+                    f"{r['delta_rss_kb'] / 1024:>9.1f}MB {r['findings']:>9}"
+                )
+
+    print("Multiple-declaration regex:")
+    for length in (1_000, 4_000):
+        bench_regex(f"{length:>6} commas, no ';'", "int a" + ", b" * length + " = 0")
+    # Worst case once truncated to GUARD_MAX_LINE_LENGTH: one long name, then ';'
+    for length in (2_000, 8_000):
+        bench_regex(f"{length:>6}-char name + ';'", "int " + "a" * (length - 5) + ";")
+
+
+if __name__ == "__main__":
+    main()
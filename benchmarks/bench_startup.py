@@ -0,0 +1,106 @@
+"""
+Cold and warm time-to-first-finding for a per-file review process.
+
+Spawns scripts/run.py (static only, no GitHub post) on a sample file and
+measures the time until the first JSON Lines finding reaches stdout.
+
+- cold: the repo's __pycache__ directories are removed before every run
+  and no bytecode is written, as in an image built without compileall
+- warm: bytecode is precompiled once, as the Docker image now does
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import compileall
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_SCRIPT = os.path.join(ROOT, "scripts", "run.py")
+
+SAMPLE = """import java.util.List;
+public class Sample {
+    private boolean flag;
+    public int Compute(int a,int b) {
+        if(a>b) {
+            return a-b;
+        }
+        return b;
+    }
+}
+"""
+
+
+def clear_bytecode():
+    for directory in ("src", "scripts"):
+        for dirpath, dirnames, _ in os.walk(os.path.join(ROOT, directory)):
+            if "__pycache__" in dirnames:
+                shutil.rmtree(os.path.join(dirpath, "__pycache__"))
+                dirnames.remove("__pycache__")
+
+
+def time_to_first_finding(path: str, env: dict) -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, RUN_SCRIPT, path, "--no-llm", "--no-post", "--output", "/dev/stdout", "--append"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    for line in process.stdout:
+        if line.startswith("{"):
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        elapsed = float("nan")
+    process.wait()
+    return elapsed
+
+
+def import_time(module: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ, ACTION_ROOT=os.environ.get("ACTION_ROOT", ROOT))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "Sample.java")
+        with open(path, "w") as f:
+            f.write(SAMPLE)
+
+        cold = []
+        cold_env = dict(env, PYTHONDONTWRITEBYTECODE="1")
+        for _ in range(args.runs):
+            clear_bytecode()
+            cold.append(time_to_first_finding(path, cold_env))
+
+        compileall.compile_dir(os.path.join(ROOT, "src"), quiet=1)
+        compileall.compile_dir(os.path.join(ROOT, "scripts"), quiet=1)
+        warm = [time_to_first_finding(path, env) for _ in range(args.runs)]
+
+    print(f"time to first finding over {args.runs} runs (median / min):")
+    print(f"  cold  {statistics.median(cold) * 1000:7.1f}ms / {min(cold) * 1000:7.1f}ms")
+    print(f"  warm  {statistics.median(warm) * 1000:7.1f}ms / {min(warm) * 1000:7.1f}ms")
+    print("import cost on top of a bare interpreter (requests is now lazy):")
+    baseline = import_time("sys")
+    for module in ("requests", "yaml"):
+        print(f"  {module:<9} {(import_time(module) - baseline) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
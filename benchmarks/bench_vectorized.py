@@ -0,0 +1,132 @@
+"""
+Python vs NumPy backend for the whole-file line checks.
+
+Generates a large Java-like file, runs each line check with both
+backends, verifies the findings are identical and reports the timings.
+Both timings include building the cached line metrics and scope tree.
+
+Usage:
+    python benchmarks/bench_vectorized.py [--lines N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.analysis import scope_tree, static_checks, vectorized
+from src.reviewer.models import Severity
+from src.rules.rule_definitions import Rule
+
+STATEMENTS = [
+    "int value = compute(a, b);",
+    "String name = user.getName();",
+    "if (value > limit) {",
+    "for (int i = 0; i < size; i++) {",
+    "}",
+    "log.debug(\"value: \" + value);",
+    "",
+]
+
+
+def generate(lines: int, violation_rate: float = 0.02, seed: int = 0) -> str:
+    """Mostly well-formatted nested code with a small share of violations"""
+    rng = random.Random(seed)
+    out = ["public class Sample {"]
+    depth = 1
+    while len(out) < lines:
+        statement = rng.choice(STATEMENTS)
+        if statement.endswith("{") and depth >= 6:
+            statement = STATEMENTS[0]
+        elif statement == "}" and depth > 1:
+            depth -= 1
+        elif statement == "}":
+            continue
+
+        line = " " * (depth * 4) + statement if statement else ""
+        if rng.random() < violation_rate:
+            line = rng.choice([
+                line + "   ",
+                "\t" + line.lstrip(),
+                line[2:],
+                line + " // " + "x" * 130,
+            ])
+        out.append(line)
+
+        if statement.endswith("{"):
+            depth += 1
+    out.extend(" " * (d * 4) + "}" for d in range(depth - 1, -1, -1))
+    return "\n".join(out) + "\n"
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def clear_caches():
+    vectorized.line_metrics.cache_clear()
+    scope_tree.build_scope_tree.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not vectorized.numpy_available():
+        sys.exit("numpy is not installed")
+
+    code = generate(args.lines)
+    print(f"{args.lines} lines, {len(code)} characters; best of {args.repeat}")
+    print(f"{'rule':<26} {'python':>9} {'numpy':>9} {'speedup':>8} {'findings':>9}")
+
+    total_python = total_numpy = 0.0
+    for rule_id, fast in vectorized.VECTORIZED_CHECKERS.items():
+        rule = Rule(rule_id, "", "line", Severity.MINOR, "")
+        slow = static_checks.CHECKERS[rule_id]
+
+        expected = slow("Bench.java", code, rule)
+        clear_caches()
+        if fast("Bench.java", code, rule) != expected:
+            sys.exit(f"{rule_id}: backends disagree")
+
+        def run_python():
+            clear_caches()
+            slow("Bench.java", code, rule)
+
+        def run_numpy():
+            clear_caches()
+            fast("Bench.java", code, rule)
+
+        python_time = best_of(args.repeat, run_python)
+
+        numpy_time = best_of(args.repeat, run_numpy)
+        total_python += python_time
+        total_numpy += numpy_time
+        print(
+            f"{rule_id:<26} {python_time * 1000:>7.1f}ms {numpy_time * 1000:>7.1f}ms "
+            f"{python_time / numpy_time:>7.1f}x {len(expected):>9}"
+        )
+
+    def run_family():
+        clear_caches()
+        for rule_id, fast in vectorized.VECTORIZED_CHECKERS.items():
+            fast("Bench.java", code, Rule(rule_id, "", "line", Severity.MINOR, ""))
+
+    family_time = best_of(args.repeat, run_family)
+    print(f"{'whole family (shared)':<26} {total_python * 1000:>7.1f}ms {family_time * 1000:>7.1f}ms "
+          f"{total_python / family_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Review staged Java changes locally, e.g. from a pre-commit hook.
+
+Reads the staged version of each changed file straight from the index,
+runs the static checks in-process and prints only findings on staged
+lines. Nothing is posted and no network is used unless --llm is given;
+LLM responses are then cached on disk (LLM_CACHE_DIR), so re-running on
+unchanged code costs nothing.
+
+Usage:
+    python scripts/review_staged.py [--all-lines] [--llm] [--fail-on LEVEL] [paths...]
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Rules and config live next to this script, not under /action
+os.environ.setdefault("ACTION_ROOT", ROOT)
+os.environ.setdefault("LLM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "llm-code-style-reviewer"))
+
+from src.analysis.guard import guard_text, load_guard_limits_from_env
+from src.reviewer.console import print_comments
+from src.reviewer.git_source import GitBlobReader, staged_line_ranges
+from src.reviewer.models import Severity
+from src.reviewer.pipeline import run_reviewer
+
+SEVERITY_ORDER = [Severity.INFO, Severity.MINOR, Severity.MAJOR]
+
+
+def should_fail(comments, fail_on: str) -> bool:
+    if fail_on == "never":
+        return False
+    threshold = SEVERITY_ORDER.index(Severity(fail_on))
+    return any(SEVERITY_ORDER.index(c.severity) >= threshold for c in comments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="*", help="Only review these files (default: all staged .java files)")
+    parser.add_argument("--all-lines", action="store_true", help="Report findings anywhere in the staged files")
+    parser.add_argument("--llm", action="store_true", help="Add a cached LLM review (needs config.yaml)")
+    parser.add_argument("--fail-on", choices=["info", "minor", "major", "never"], default="major",
+                        help="Exit 1 if a finding at or above this severity is reported")
+    args = parser.parse_args()
+
+    changed = {path: ranges for path, ranges in staged_line_ranges().items() if path.endswith(".java")}
+    if args.paths:
+        wanted = {os.path.normpath(p) for p in args.paths}
+        changed = {path: ranges for path, ranges in changed.items() if os.path.normpath(path) in wanted}
+    if not changed:
+        return 0
+
+    limits = load_guard_limits_from_env()
+    findings = []
+    with GitBlobReader() as reader:
+        # ":<path>" is the staged (index) version
+        blobs = reader.read_many([("", path) for path in changed], max_bytes=limits.max_file_bytes)
+
+    for (path, ranges), blob in zip(changed.items(), blobs):
+        if blob is None:
+            continue
+        code = guard_text(blob, limits).code
+        # Filtered before findings on adjacent lines are collapsed, so
+        # unstaged lines never widen a reported range
+        comments = run_reviewer(path, code, enable_llm=args.llm, max_findings_per_rule=limits.max_findings_per_rule,
+                                line_ranges=None if args.all_lines else ranges)
+        findings.extend(c for c in comments if c.rule_id != "NO_ISSUES")
+
+    print_comments(findings)
+    return 1 if should_fail(findings, args.fail_on) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,26 @@
+import argparse
+import glob
 import sys
 import os
-import requests
+import time
 
 # Add parent directory to path so we can import src
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.reviewer.pipeline import run_reviewer
+from src.analysis.guard import load_guard_limits_from_env, read_source_guarded
+from src.reviewer.exporters import JsonLinesWriter, open_writer
+from src.reviewer.git_source import clamp_to_hunk
+from src.reviewer.baseline import Baseline
+from src.reviewer.console import print_comments
+from src.reviewer.pipeline import (
+    CHECKER_PLUGIN_DIRS,
+    EXTRA_STATIC_RULES,
+    LLM_RULES_PATH,
+    STATIC_RULES_PATH,
+    load_static_rules,
+    run_reviewer,
+    run_static_checks,
+)
 from src.reviewer.models import StyleComment
 
 
@@ -34,16 +49,55 @@ def format_comment_markdown(comment: StyleComment) -> str:
         
     source_label = "🤖 AI Analysis" if comment.source.value.upper() == "LLM" else "🔍 Static Check"
 
+    location = ""
+    if comment.end_line and comment.end_line > comment.line_number:
+        location = f"**Lines:** {comment.line_number}-{comment.end_line}\n\n"
+
     # 3. Build a structured Markdown response
     return (
         f"### {emoji} {source_label} Suggestion\n"
         f"**Rule:** `{comment.rule_id}`\n\n"
+        f"{location}"
         f"> {clean_msg}\n\n"
         f"---\n"
         f"*Found in {comment.file_path}*"
     )
 
-def post_github_review(all_comments):
+def github_review_comment(c: StyleComment, diff_ranges=None) -> dict:
+    """Review API comment for c; see post_github_review for diff_ranges"""
+    # Ensure line_number is at least 1
+    ln = c.line_number if c.line_number > 0 else 1
+
+    github_comment = {
+        "path": c.file_path,
+        "line": ln,
+        "body": format_comment_markdown(c),
+        "side": "RIGHT" # This places the comment on the NEW version of the code
+    }
+
+    # Collapsed runs become a single multi-line comment within one hunk
+    if c.end_line and c.end_line > ln:
+        start, end = clamp_to_hunk(ln, c.end_line, (diff_ranges or {}).get(c.file_path, []))
+        github_comment["line"] = end
+        if start < end:
+            github_comment.update({"start_line": start, "start_side": "RIGHT"})
+    return github_comment
+
+
+def post_github_review(all_comments, diff_ranges=None):
+    """
+    Post comments as one pull request review.
+
+    Args:
+        all_comments: Comments to post
+        diff_ranges: Path -> new-side hunk ranges of the PR diff
+            (git_source.diff_line_ranges). Ranged comments are clamped to one
+            hunk, since GitHub rejects the whole review if a multi-line
+            comment leaves its hunk. Without it they are posted on their
+            first line only (the body still names the full range).
+    """
+    import requests
+
     token = os.getenv("GITHUB_TOKEN")
     repo = os.getenv("GITHUB_REPOSITORY")
     pr_number = os.getenv("GITHUB_EVENT_PATH") # You'll need to parse the PR number from the event JSON
@@ -62,17 +116,7 @@ def post_github_review(all_comments):
     }
 
     # Format alerts for the GitHub API
-    github_comments = []
-    for c in all_comments:
-        # Ensure line_number is at least 1
-        ln = c.line_number if c.line_number > 0 else 1
-        
-        github_comments.append({
-            "path": c.file_path,
-            "line": ln,
-            "body": format_comment_markdown(c),
-            "side": "RIGHT" # This places the comment on the NEW version of the code
-        })
+    github_comments = [github_review_comment(c, diff_ranges) for c in all_comments]
 
     payload = {
         "event": "COMMENT", # Use "REQUEST_CHANGES" if severity is 'major'
@@ -85,16 +129,119 @@ def post_github_review(all_comments):
         print(f"Failed to post review: {response.text}")
 
 
+def infer_output_format(path: str) -> str:
+    return "sarif" if path.endswith((".sarif", ".sarif.json")) else "jsonl"
+
+
+def export_comments(comments, path: str, output_format: str, append: bool = False):
+    findings = [c for c in comments if c.rule_id != "NO_ISSUES"]
+    if append and output_format != "jsonl":
+        raise ValueError(f"Cannot append {output_format} output; only jsonl supports --append")
+    writer = JsonLinesWriter(path, append=True) if append else open_writer(output_format, path)
+    with writer:
+        for c in findings:
+            writer.write(c)
+
+
+def watched_files(path: str) -> list[str]:
+    """The reviewed file, rule files and plugin checkers"""
+    files = [path, STATIC_RULES_PATH, LLM_RULES_PATH, *EXTRA_STATIC_RULES]
+    for directory in CHECKER_PLUGIN_DIRS:
+        files.extend(sorted(glob.glob(os.path.join(directory, "**", "*.py"), recursive=True)))
+    return files
+
+
+def file_versions(files: list[str]) -> dict:
+    versions = {}
+    for f in files:
+        try:
+            stat = os.stat(f)
+            versions[f] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            versions[f] = None
+    return versions
+
+
+def watch(path: str, review, interval: float):
+    """
+    Re-run review whenever the file, a rule file or a plugin checker changes.
+
+    Rules and plugins are reloaded in-process, so edits take effect without
+    a restart. Stop with Ctrl-C.
+    """
+    last = None
+    try:
+        while True:
+            current = file_versions(watched_files(path))
+            if current != last:
+                last = current
+                print(f"--- {time.strftime('%H:%M:%S')} reviewing {path}")
+                print_comments(review())
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == "__main__":
-    path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Review a single Java file")
+    parser.add_argument("path")
+    parser.add_argument("--no-llm", action="store_true", help="Run static checks only")
+    parser.add_argument("--no-post", action="store_true", help="Do not post a GitHub review")
+    parser.add_argument("--output", help="Write findings to this file")
+    parser.add_argument("--output-format", choices=["jsonl", "sarif"], help="Defaults from the --output extension")
+    parser.add_argument("--append", action="store_true", help="Append JSON Lines to --output (shard mode)")
+    parser.add_argument("--baseline", help="Only report findings not recorded in this baseline file")
+    parser.add_argument("--write-baseline", help="Record this file's static findings into a baseline file and exit")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-review on changes to the file, rules or plugin checkers")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval for --watch in seconds")
+    args = parser.parse_args()
+    if args.append and (not args.output or (args.output_format or infer_output_format(args.output)) != "jsonl"):
+        # A SARIF document cannot be appended to, and writing JSON Lines to a .sarif file is wrong
+        parser.error("--append needs a JSON Lines --output")
+
+    path = args.path
     print(f"Running reviewer on {path}")
 
-    with open(path, "r") as f:
-        code = f.read()
+    limits = load_guard_limits_from_env()
+    source = read_source_guarded(path, limits)
+    if source.truncated_lines:
+        print(f"Warning: truncated {source.truncated_lines} line(s) longer than {limits.max_line_length} characters")
+    if source.stopped_at_line:
+        print(f"Warning: file exceeds {limits.max_file_bytes} characters; stopped reading at line {source.stopped_at_line}")
+
+    if args.write_baseline:
+        baseline = Baseline.load(args.write_baseline) if os.path.exists(args.write_baseline) else Baseline()
+        baseline.add(path, source.code, run_static_checks(path, source.code, load_static_rules()))
+        baseline.save(args.write_baseline)
+        print(f"Recorded baseline for {path} in {args.write_baseline}")
+        sys.exit(0)
+
+    baseline = Baseline.load(args.baseline) if args.baseline else None
+
+    if args.watch:
+        # Terminal output only: nothing is posted or exported while watching
+        def review():
+            code = read_source_guarded(path, limits).code
+            return run_reviewer(path, code, enable_llm=not args.no_llm,
+                                max_findings_per_rule=limits.max_findings_per_rule, baseline=baseline)
+
+        watch(path, review, args.interval)
+        sys.exit(0)
+
+    comments = run_reviewer(
+        path,
+        source.code,
+        enable_llm=not args.no_llm,
+        max_findings_per_rule=limits.max_findings_per_rule,
+        baseline=baseline,
+    )
 
-    comments = run_reviewer(path, code)
+    if args.output:
+        export_comments(comments, args.output, args.output_format or infer_output_format(args.output), args.append)
 
-    post_github_review(comments)
+    if not args.no_post:
+        post_github_review(comments)
 
     if any(c.severity == "major" for c in comments):
         sys.exit(1)  # Exit with error code if there are major issues
@@ -2,56 +2,407 @@ import os
 import subprocess
 import sys
 
+# Add parent directory to path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.run import infer_output_format, post_github_review
+from src.analysis.guard import guard_text, load_guard_limits_from_env
+from src.reviewer.baseline import Baseline
+from src.reviewer.budget import (
+    BudgetGovernor,
+    FilePriority,
+    estimate_tokens,
+    load_budget_from_env,
+    prioritize,
+)
+from src.reviewer.exporters import JsonLinesWriter
+from src.reviewer.git_source import (
+    GitBlobReader,
+    blob_sizes,
+    change_sizes,
+    diff_line_ranges,
+    list_changed_files,
+    merge_base,
+    prefetch_blobs,
+)
+from src.reviewer.pipeline import (
+    LLM_RULES_PATH,
+    check_static_rules,
+    llm_usage_report,
+    load_static_rules,
+    run_reviewer,
+    run_static_checks,
+    should_send_to_llm,
+)
+from src.reviewer.sharding import (
+    ShardFileError,
+    file_weights,
+    find_shards,
+    merge_shard_comments,
+    partition,
+    shard_output_path,
+)
+from src.reviewer.triage import Triage
+from src.rules.rule_loader import load_rules
+
 BASE_BRANCH = os.getenv("BASE_BRANCH") or os.getenv("GITHUB_BASE_REF") or "main"
+BASE_REF = f"origin/{BASE_BRANCH}"
+HEAD_REF = "HEAD"
+OUTPUT_PATH = os.getenv("OUTPUT_PATH") or None
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT") or None
+POST_REVIEW = os.getenv("POST_REVIEW", "true").strip().lower() not in ("0", "false", "no", "off")
+# "off", "base" (findings of the base revision) or "file" (BASELINE_PATH)
+BASELINE_MODE = (os.getenv("BASELINE") or "off").strip().lower()
+BASELINE_PATH = os.getenv("BASELINE_PATH") or None
+# Opt-in: triage changes which files the LLM sees
+TRIAGE_ENABLED = (os.getenv("LLM_TRIAGE") or "false").strip().lower() in ("1", "true", "yes", "on")
+GUARD_LIMITS = load_guard_limits_from_env()
+# Matrix sharding: this job reviews shard SHARD_INDEX (0-based) of SHARD_COUNT
+SHARD_COUNT = int(os.getenv("SHARD_COUNT") or 1)
+SHARD_INDEX = int(os.getenv("SHARD_INDEX") or 0)
+SHARDED = SHARD_COUNT > 1
+SHARD_OUTPUT = os.getenv("SHARD_OUTPUT") or "review-shard-{index}-of-{count}.jsonl"
+# Glob of shard files; when set, merge them and post one review instead of reviewing
+MERGE_SHARDS = os.getenv("MERGE_SHARDS") or None
+# Weight applied to the priority score of files triage deprioritizes
+DEPRIORITIZED_WEIGHT = 0.25
+
+def fetch_base_branch():
+    """
+    Make origin/<base> available without a full fetch.
+
+    A checkout with fetch-depth: 0 already has the ref, so nothing is
+    fetched. Otherwise only the base branch is fetched, without tags or
+    blobs; diffing names needs commits and trees only. The base versions
+    that are read later are fetched in one batch by prefetch_base_blobs.
+    """
+    ref = f"refs/remotes/origin/{BASE_BRANCH}"
+    exists = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", ref],
+        capture_output=True,
+        check=False
+    )
+    if exists.returncode == 0:
+        return
+
+    subprocess.run(
+        ["git", "fetch", "--no-tags", "--filter=blob:none", "origin", f"+refs/heads/{BASE_BRANCH}:{ref}"],
+        check=True
+    )
+
 
 def get_changed_java_files():
     try:
-        subprocess.run(["git", "fetch", "origin", BASE_BRANCH], check=True)
+        fetch_base_branch()
 
-        result = subprocess.run(
-            ["git", "diff", "--name-only", f"origin/{BASE_BRANCH}...HEAD"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        files = [
-            f.strip()
-            for f in result.stdout.splitlines()
-            if f.endswith(".java")
+        return [
+            change
+            for change in list_changed_files(BASE_REF, HEAD_REF)
+            if change.path.endswith(".java")
         ]
 
-        return files
-
     except Exception as e:
         print(f"Error detecting changed files: {e}")
         sys.exit(1)
 
 
+def get_diff_ranges():
+    """Hunk ranges of the PR diff for placing review comments, or None if git cannot tell"""
+    try:
+        return diff_line_ranges(BASE_REF, HEAD_REF)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Warning: could not read PR diff hunks; ranged comments go on their first line: {e}")
+        return None
+
+
+def prefetch_base_blobs(changes, base_rev):
+    """Fetch the base versions triage and BASELINE=base will read, in one request"""
+    if not (TRIAGE_ENABLED or BASELINE_MODE == "base"):
+        return
+    try:
+        count = prefetch_blobs(base_rev, sorted({change.base_path for change in changes}))
+        if count:
+            print(f"Prefetched {count} base blob(s)")
+    except subprocess.CalledProcessError as e:
+        # Reads still work, git just fetches each missing blob on demand
+        print(f"Warning: could not prefetch base blobs: {e}")
+
+
+def select_shard(changes):
+    """The changed files this job reviews, from a size-weighted partition"""
+    if not 0 <= SHARD_INDEX < SHARD_COUNT:
+        raise ValueError(f"SHARD_INDEX must be in [0, {SHARD_COUNT}), got {SHARD_INDEX}")
+
+    sizes = blob_sizes(HEAD_REF, [change.path for change in changes])
+    weights = file_weights({change.path: sizes.get(change.path, 0) for change in changes})
+    selected = set(partition(weights, SHARD_COUNT)[SHARD_INDEX])
+    return [change for change in changes if change.path in selected]
+
+
+def read_revision(reader, rev, path):
+    """Guarded contents of path at rev, or None if it does not exist there"""
+    code = reader.read(rev, path, max_bytes=GUARD_LIMITS.max_file_bytes)
+    return None if code is None else guard_text(code, GUARD_LIMITS).code
+
+
+def triage_files(changes, reader, base_rev):
+    triage = Triage(
+        audit_path=os.getenv("TRIAGE_AUDIT_PATH") or None,
+        state_path=os.getenv("TRIAGE_STATE_PATH") or None,
+    )
+
+    # Head and base versions for every file in one pipelined batch
+    requests = []
+    for change in changes:
+        requests += [(HEAD_REF, change.path), (base_rev, change.base_path)]
+    blobs = reader.read_many(requests, max_bytes=GUARD_LIMITS.max_file_bytes)
+
+    decisions = {}
+    for i, change in enumerate(changes):
+        head, base = blobs[2 * i], blobs[2 * i + 1]
+        code = guard_text(head or "", GUARD_LIMITS).code
+        base_code = None if base is None else guard_text(base, GUARD_LIMITS).code
+        decisions[change.path] = triage.assess(change.path, code, base_code, change.base_path)
+    triage.save()
+    return decisions
+
+
+def plan_review(changes, decisions, reader):
+    """
+    Order files by priority, using static findings from a quick pre-pass.
+
+    Returns:
+        The ordered plan, and path -> raw static findings of the pre-pass
+        for run_reviewer to reuse
+    """
+    static_rules = load_static_rules()
+    sizes = change_sizes(BASE_REF, HEAD_REF)
+
+    priorities = []
+    prepass = {}
+    for change in changes:
+        file = change.path
+        code = read_revision(reader, HEAD_REF, file) or ""
+        prepass[file] = check_static_rules(file, code, static_rules)
+        findings = run_static_checks(file, code, static_rules, GUARD_LIMITS.max_findings_per_rule,
+                                     raw_findings=prepass[file])
+        priorities.append(
+            FilePriority(
+                path=file,
+                changed_lines=sizes.get(file, 0),
+                line_count=len(code.splitlines()),
+                static_findings=len(findings),
+                weight=DEPRIORITIZED_WEIGHT if file in decisions and decisions[file].action == "deprioritize" else 1.0,
+            )
+        )
+
+    return prioritize(priorities), prepass
+
+
+def get_estimate_inputs():
+    """Prompt the LLM will actually receive and its completion allowance, for budgeting"""
+    from src.llm.config import load_config
+    from src.llm.llm_reviewer import build_review_prompt
+    from src.reviewer.pipeline import CONFIG_PATH
+
+    try:
+        config = load_config(CONFIG_PATH)
+        structured_output, max_output_tokens = config.structured_output, config.max_tokens
+    except Exception:
+        structured_output, max_output_tokens = False, 1000
+
+    try:
+        llm_rules = load_rules(LLM_RULES_PATH)
+    except Exception:
+        llm_rules = []
+    return build_review_prompt(llm_rules, structured_output), max_output_tokens
+
+
+def load_baseline():
+    if BASELINE_MODE == "file":
+        if not BASELINE_PATH:
+            raise ValueError("BASELINE=file requires BASELINE_PATH")
+        return Baseline.load(BASELINE_PATH)
+    if BASELINE_MODE == "base":
+        return Baseline()
+    if BASELINE_MODE != "off":
+        raise ValueError(f"Unsupported baseline mode: {BASELINE_MODE}. Supported modes: ['off', 'base', 'file']")
+    return None
+
+
+def add_base_findings(baseline, change, reader, static_rules, base_rev):
+    """Record the static findings of the base version of a file"""
+    base_code = read_revision(reader, base_rev, change.base_path)
+    if base_code is not None:
+        baseline.add(change.path, base_code, run_static_checks(change.path, base_code, static_rules))
+
+
+def open_output():
+    """Writer for OUTPUT_PATH, with rule descriptions for SARIF"""
+    from src.reviewer.exporters import open_writer
+
+    rules = []
+    for load in (load_static_rules, lambda: load_rules(LLM_RULES_PATH)):
+        try:
+            rules.extend(load())
+        except Exception as e:
+            print(f"Warning: could not load rules for output: {e}")
+
+    return open_writer(OUTPUT_FORMAT or infer_output_format(OUTPUT_PATH), OUTPUT_PATH, rules)
+
+
 def main():
     subprocess.run(
         ["git", "config", "--global", "--add", "safe.directory", "/github/workspace"],
         check=False
     )
-    files = get_changed_java_files()
+    changes = []
+    for change in get_changed_java_files():
+        if change.status == "D":
+            print(f"Skipping deleted file {change.path}")
+        else:
+            changes.append(change)
 
-    if not files:
+    # Sharded runs always leave a shard file, even an empty one, for the merge step
+    shard_writer = None
+    if SHARDED:
+        changes = select_shard(changes) if changes else []
+        shard_path = shard_output_path(SHARD_OUTPUT, SHARD_INDEX, SHARD_COUNT)
+        os.makedirs(os.path.dirname(shard_path) or ".", exist_ok=True)
+        shard_writer = JsonLinesWriter(shard_path)
+        print(f"Shard {SHARD_INDEX + 1}/{SHARD_COUNT}: {len(changes)} file(s), results in {shard_path}")
+
+    if not changes:
+        if shard_writer:
+            shard_writer.close()
         print("No Java files changed.")
         sys.exit(0)
 
     exit_code = 0
+    governor = None
+    all_comments = []
+    writer = open_output() if OUTPUT_PATH else None
+    baseline = load_baseline()
+    changes_by_path = {change.path: change for change in changes}
+    static_rules = load_static_rules() if BASELINE_MODE == "base" else None
 
-    for file in files:
-        print(f"Reviewing {file}")
-        result = subprocess.run(
-            ["python", "/action/scripts/run.py", file]
-        )
+    # Base versions are read at the merge base, the revision the diff is
+    # relative to, not at the tip of the base branch
+    base_rev = merge_base(BASE_REF, HEAD_REF)
+    prefetch_base_blobs(changes, base_rev)
+
+    with GitBlobReader() as reader:
+        plan = [FilePriority(change.path, 0, 0, 0) for change in changes]
+        prepass = {}
+        decisions = triage_files(changes, reader, base_rev) if TRIAGE_ENABLED else {}
+
+        budget = load_budget_from_env()
+        if budget.is_limited:
+            governor = BudgetGovernor(budget)
+            plan, prepass = plan_review(changes, decisions, reader)
+            review_prompt, max_output_tokens = get_estimate_inputs()
+
+        for entry in plan:
+            file = entry.path
+            if governor and governor.time_exhausted():
+                governor.skip(file, "wall time budget exhausted")
+                continue
+
+            code = read_revision(reader, HEAD_REF, file) or ""
+            enable_llm = True
 
-        if result.returncode != 0:
-            exit_code = result.returncode
+            if file in decisions and decisions[file].action == "skip":
+                enable_llm = False
+            elif governor and should_send_to_llm(code):
+                estimated = estimate_tokens(review_prompt, code, max_output_tokens)
+                enable_llm = governor.acquire_llm(file, estimated)
+
+            print(f"Reviewing {file}")
+            try:
+                if static_rules:
+                    add_base_findings(baseline, changes_by_path[file], reader, static_rules, base_rev)
+
+                comments = run_reviewer(
+                    file,
+                    code,
+                    enable_llm=enable_llm,
+                    max_findings_per_rule=GUARD_LIMITS.max_findings_per_rule,
+                    baseline=baseline,
+                    static_findings=prepass.pop(file, None),
+                )
+            except Exception as e:
+                print(f"Error reviewing {file}: {e}")
+                exit_code = 1
+                continue
+
+            all_comments.extend(comments)
+            if shard_writer:
+                # "No issues" entries included, so the merged review matches a single run
+                for c in comments:
+                    shard_writer.write(c)
+            if writer:
+                for c in comments:
+                    if c.rule_id != "NO_ISSUES":
+                        writer.write(c)
+
+    if governor:
+        print(governor.report())
+
+    usage = llm_usage_report()
+    if usage:
+        print("LLM backends:")
+        for line in usage:
+            print(f"  {line}")
+
+    if writer:
+        writer.close()
+        print(f"Wrote {writer.count} finding(s) to {OUTPUT_PATH}")
+
+    if shard_writer:
+        # The merge step posts the review and fails the run on major issues
+        shard_writer.close()
+        sys.exit(exit_code)
+
+    if POST_REVIEW:
+        post_github_review(all_comments, get_diff_ranges())
+
+    if any(c.severity == "major" for c in all_comments):
+        exit_code = 1  # Exit with error code if there are major issues
 
     sys.exit(exit_code)
 
 
+def merge_main():
+    """Combine shard files into one set of findings and post a single review"""
+    paths = find_shards(MERGE_SHARDS)
+    if not paths:
+        print(f"No shard files match {MERGE_SHARDS}")
+        sys.exit(1)
+
+    # With SHARD_COUNT set, a shard whose file never arrived fails the merge
+    try:
+        comments = merge_shard_comments(paths, SHARD_COUNT if SHARDED else None)
+    except ShardFileError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Merged {len(comments)} comment(s) from {len(paths)} shard file(s)")
+
+    if OUTPUT_PATH:
+        writer = open_output()
+        with writer:
+            for c in comments:
+                if c.rule_id != "NO_ISSUES":
+                    writer.write(c)
+        print(f"Wrote {writer.count} finding(s) to {OUTPUT_PATH}")
+
+    if POST_REVIEW:
+        post_github_review(comments, get_diff_ranges())
+
+    sys.exit(1 if any(c.severity == "major" for c in comments) else 0)
+
+
 if __name__ == "__main__":
-    main()
+    if MERGE_SHARDS:
+        merge_main()
+    else:
+        main()
@@ -0,0 +1,81 @@
+"""
+Minimal OpenAI-compatible chat completions server for offline testing.
+
+Answers POST .../chat/completions with a fixed reply (an empty findings
+object when JSON mode is requested), after an optional delay, or with a
+fixed error status, e.g. 429 to simulate a throttled provider.
+
+Usage:
+    python scripts/stub_llm_server.py --port 8081 [--latency 0.5] [--status 429] [--reply TEXT]
+
+Then point a provider's base_url at http://127.0.0.1:8081/v1.
+"""
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(args):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict, headers: dict = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.endswith("/chat/completions"):
+                self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+                return
+
+            time.sleep(args.latency)
+            if args.status != 200:
+                headers = {"Retry-After": str(args.retry_after)} if args.retry_after is not None else None
+                self._send(args.status, {"error": {"message": f"stub status {args.status}"}}, headers)
+                return
+
+            if args.reply is not None:
+                reply = args.reply
+            elif request.get("response_format", {}).get("type") == "json_object":
+                reply = json.dumps({"findings": []})
+            else:
+                reply = "No issues found."
+            self._send(200, {
+                "model": request.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}}],
+            })
+
+        def log_message(self, format, *log_args):
+            print(f"[stub :{args.port}] {format % log_args}", file=sys.stderr)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument("--status", type=int, default=200, help="Answer every request with this status")
+    parser.add_argument("--retry-after", type=float, help="Retry-After header for error responses")
+    parser.add_argument("--reply", help="Assistant message to return")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args))
+    print(f"Stub LLM server on http://{args.host}:{args.port}/v1", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
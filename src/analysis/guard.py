@@ -0,0 +1,120 @@
+"""
+Guards for huge, generated and minified source files.
+
+Files are read line by line with a bounded readline, so a single
+multi-megabyte line is never held in memory. Lines longer than the limit
+are truncated before any regex sees them (they still exceed the line
+length rule), reading stops at a byte cap, and each rule's findings per
+file are capped.
+"""
+
+import io
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from src.reviewer.models import StyleComment
+
+
+@dataclass
+class GuardLimits:
+    max_file_bytes: int = 2_000_000
+    max_line_length: int = 2_000
+    max_findings_per_rule: int = 50
+
+
+@dataclass
+class GuardedSource:
+    code: str
+    truncated_lines: int = 0
+    stopped_at_line: Optional[int] = None
+
+
+def load_guard_limits_from_env() -> GuardLimits:
+    """
+    Environment variables:
+    - GUARD_MAX_FILE_BYTES: Stop reading a file after this many characters
+    - GUARD_MAX_LINE_LENGTH: Truncate longer lines before checks run
+    - GUARD_MAX_FINDINGS_PER_RULE: Per-file cap on findings of one rule
+    """
+    defaults = GuardLimits()
+    return GuardLimits(
+        max_file_bytes=int(os.getenv("GUARD_MAX_FILE_BYTES", defaults.max_file_bytes)),
+        max_line_length=int(os.getenv("GUARD_MAX_LINE_LENGTH", defaults.max_line_length)),
+        max_findings_per_rule=int(os.getenv("GUARD_MAX_FINDINGS_PER_RULE", defaults.max_findings_per_rule)),
+    )
+
+
+def _read_guarded(f, limits: GuardLimits) -> GuardedSource:
+    lines = []
+    total = 0
+    truncated_lines = 0
+    stopped_at_line = None
+
+    while True:
+        line = f.readline(limits.max_line_length + 1)
+        if not line:
+            break
+
+        if len(line) > limits.max_line_length and not line.endswith("\n"):
+            # Drain the rest of the pathological line in bounded chunks
+            truncated_lines += 1
+            ending = ""
+            while True:
+                rest = f.readline(limits.max_line_length)
+                if not rest or rest.endswith("\n"):
+                    ending = "\n" if rest else ""
+                    break
+            line = line[:limits.max_line_length] + ending
+
+        total += len(line)
+        if total > limits.max_file_bytes:
+            stopped_at_line = len(lines) + 1
+            break
+        lines.append(line)
+
+    return GuardedSource("".join(lines), truncated_lines, stopped_at_line)
+
+
+def read_source_guarded(path: str, limits: GuardLimits) -> GuardedSource:
+    """
+    Stream a file into a bounded string.
+
+    Args:
+        path: File to read
+        limits: Size limits to apply
+
+    Returns:
+        GuardedSource with the (possibly truncated) code
+    """
+    with open(path, "r", errors="replace") as f:
+        return _read_guarded(f, limits)
+
+
+def guard_text(text: str, limits: GuardLimits) -> GuardedSource:
+    """Apply the same limits to source that is already in memory (e.g. a git blob)"""
+    return _read_guarded(io.StringIO(text), limits)
+
+
+def cap_findings(comments: list[StyleComment], max_per_rule: int) -> list[StyleComment]:
+    """
+    Keep at most max_per_rule comments per (file, rule).
+
+    The last kept comment notes how many more were dropped.
+    """
+    kept = []
+    counts = {}
+    last_kept = {}
+
+    for c in comments:
+        key = (c.file_path, c.rule_id)
+        counts[key] = counts.get(key, 0) + 1
+        if counts[key] <= max_per_rule:
+            kept.append(c)
+            last_kept[key] = c
+
+    for key, count in counts.items():
+        if count > max_per_rule:
+            c = last_kept[key]
+            c.message = f"{c.message} ({count - max_per_rule} more occurrences in this file not shown)"
+    return kept
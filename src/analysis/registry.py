@@ -0,0 +1,128 @@
+"""
+Checker registry with lazily loaded plugins.
+
+Built-in rules map to CHECKERS by rule ID. A rule can instead name its
+checker with a `checker:` field:
+
+- "module:function": function from module.py in a plugin directory
+  (CHECKER_PLUGIN_DIRS), or from any importable module
+- "name": an entry point in the CHECKER_ENTRY_POINT_GROUP group, for
+  checks shipped as an installed package
+
+Plugins are imported the first time a rule references them, so unused
+plugins cost nothing at startup. Plugin directory modules are re-imported
+when their file changes (see refresh), which lets long-running processes
+pick up edited checks without restarting.
+"""
+
+import importlib
+import importlib.util
+import os
+from typing import Callable, Optional
+
+from src.rules.rule_definitions import Rule
+
+CHECKER_ENTRY_POINT_GROUP = "llm_code_style_reviewer.checkers"
+
+
+def _file_version(path: str) -> tuple:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CheckerRegistry:
+    def __init__(self, builtin: dict, plugin_dirs: list[str] = None,
+                 entry_point_group: str = CHECKER_ENTRY_POINT_GROUP):
+        self.builtin = builtin
+        self.plugin_dirs = plugin_dirs or []
+        self.entry_point_group = entry_point_group
+        self._resolved = {}
+        # Plugin directory modules: name -> (path, version, module)
+        self._plugin_modules = {}
+        self._entry_points = None
+
+    def _load_plugin_module(self, name: str):
+        for directory in self.plugin_dirs:
+            path = os.path.join(directory, name.replace(".", os.sep) + ".py")
+            if not os.path.isfile(path):
+                continue
+
+            cached = self._plugin_modules.get(name)
+            if cached and cached[0] == path and cached[2] is not None:
+                return cached[2]
+
+            # Tracked before executing, so a broken file is retried once it changes
+            self._plugin_modules[name] = (path, _file_version(path), None)
+            # Loaded outside sys.modules so a changed file can be re-imported
+            spec = importlib.util.spec_from_file_location(f"style_checker_plugins.{name}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._plugin_modules[name] = (path, self._plugin_modules[name][1], module)
+            return module
+        return None
+
+    def _load_entry_point(self, name: str) -> Optional[Callable]:
+        if self._entry_points is None:
+            from importlib.metadata import entry_points
+
+            self._entry_points = {ep.name: ep for ep in entry_points(group=self.entry_point_group)}
+
+        ep = self._entry_points.get(name)
+        return ep.load() if ep else None
+
+    def _load(self, reference: str) -> Optional[Callable]:
+        if ":" not in reference:
+            return self._load_entry_point(reference)
+
+        module_name, attr = reference.split(":", 1)
+        module = self._load_plugin_module(module_name) or importlib.import_module(module_name)
+        return getattr(module, attr)
+
+    def resolve(self, rule: Rule) -> Optional[Callable]:
+        """
+        Find the checker for a rule, importing its plugin on first use.
+
+        Args:
+            rule: Rule to check
+
+        Returns:
+            The checker function, or None if the rule has none or its plugin
+            cannot be loaded (a warning is printed once)
+        """
+        if not rule.checker:
+            return self.builtin.get(rule.id)
+
+        if rule.checker not in self._resolved:
+            try:
+                checker = self._load(rule.checker)
+                if checker is None:
+                    print(f"Warning: no checker plugin named '{rule.checker}' for rule {rule.id}")
+            except Exception as e:
+                print(f"Warning: could not load checker '{rule.checker}' for rule {rule.id}: {e}")
+                checker = None
+            self._resolved[rule.checker] = checker
+        return self._resolved[rule.checker]
+
+    def refresh(self) -> list[str]:
+        """
+        Forget plugin directory modules whose file changed or disappeared.
+
+        They are re-imported on their next use.
+
+        Returns:
+            Names of the modules that will be reloaded
+        """
+        changed = []
+        for name, (path, version, _) in list(self._plugin_modules.items()):
+            try:
+                current = _file_version(path)
+            except OSError:
+                current = None
+            if current != version:
+                changed.append(name)
+                del self._plugin_modules[name]
+
+        if changed:
+            prefixes = tuple(f"{name}:" for name in changed)
+            self._resolved = {ref: c for ref, c in self._resolved.items() if not ref.startswith(prefixes)}
+        return changed
@@ -0,0 +1,267 @@
+"""
+Block structure of a Java file.
+
+The file is scanned once, skipping string, char and text block literals
+and comments, and every pair of braces becomes a Block. Block-aware rules
+(indentation, empty block, brace and else placement) read the shared,
+cached tree instead of guessing from the first and last character of
+adjacent lines.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+TOKEN_PATTERN = re.compile(
+    r'(?P<line_comment>//)'
+    r'|(?P<block_comment>/\*)'
+    r'|(?P<text_block>""")'
+    r'|(?P<literal>"(?:\\.|[^"\\])*"?|\'(?:\\.|[^\'\\])*\'?)'
+    r'|(?P<brace>[{}])'
+    r'|(?P<code>[^\s{}"\'/]+|/)'
+)
+BRACE_PATTERN = re.compile(r'[{}]')
+# Lines without these characters hold no literal or comment
+LITERAL_OR_COMMENT = re.compile(r'["\'/]')
+TEXT_BLOCK_END = re.compile(r'(?<!\\)"""')
+ELSE_PATTERN = re.compile(r'else\b')
+
+# A "{" after one of these opens an array or annotation initializer, not a block
+INITIALIZER_PRECEDERS = set("=,[](")
+# A "{" after one of these (or at the start of the file) is a standalone block
+STANDALONE_PRECEDERS = set(";{}:")
+
+
+@dataclass
+class Block:
+    open_line: int
+    open_column: int
+    depth: int
+    is_initializer: bool
+    # Last code character before "{" and its line (None at start of file)
+    preceded_by: Optional[str] = None
+    preceded_on_line: Optional[int] = None
+    close_line: Optional[int] = None
+    close_column: Optional[int] = None
+    is_empty: bool = True
+    parent: Optional["Block"] = field(default=None, repr=False)
+    children: list["Block"] = field(default_factory=list, repr=False)
+
+
+@dataclass
+class LineInfo:
+    # Nesting depth for indentation: closing braces that start the line
+    # are already applied
+    depth: int = 0
+    # Columns of the first and last code characters (None if there are none)
+    first_code: Optional[int] = None
+    last_code: Optional[int] = None
+    # Starts inside a text block, so its leading whitespace is content
+    in_text_block: bool = False
+
+
+@dataclass
+class ScopeTree:
+    lines: list[LineInfo]
+    blocks: list[Block]
+    roots: list[Block]
+
+    def previous_code_line(self, line_number: int) -> Optional[int]:
+        """Closest line before line_number with code on it"""
+        for n in range(line_number - 1, 0, -1):
+            if self.lines[n - 1].first_code is not None:
+                return n
+        return None
+
+
+class _Scanner:
+    def __init__(self):
+        self.lines = []
+        self.blocks = []
+        self.roots = []
+        self.stack = []
+        self.in_block_comment = False
+        self.in_text_block = False
+        self.previous_char = None
+        self.previous_line = None
+
+    def _content(self):
+        # Comments and literals count as content of the innermost block
+        if self.stack:
+            self.stack[-1].is_empty = False
+
+    def _open(self, line_number: int, column: int):
+        parent = self.stack[-1] if self.stack else None
+        if self.previous_char == "{" and parent is not None:
+            is_initializer = parent.is_initializer
+        else:
+            is_initializer = self.previous_char in INITIALIZER_PRECEDERS
+
+        self._content()
+        block = Block(
+            open_line=line_number,
+            open_column=column,
+            depth=len(self.stack),
+            is_initializer=is_initializer,
+            preceded_by=self.previous_char,
+            preceded_on_line=self.previous_line,
+            parent=parent,
+        )
+        if parent is not None:
+            parent.children.append(block)
+        else:
+            self.roots.append(block)
+        self.blocks.append(block)
+        self.stack.append(block)
+
+    def _close(self, line_number: int, column: int):
+        if not self.stack:
+            return  # unbalanced "}", ignore rather than going negative
+        block = self.stack.pop()
+        block.close_line = line_number
+        block.close_column = column
+
+    def _scan_plain(self, line_number: int, line: str) -> LineInfo:
+        """Fast path for lines that are code only: just find the braces"""
+        code = line.rstrip()
+        info = LineInfo()
+        if not code:
+            info.depth = len(self.stack)
+            return info
+
+        info.first_code = len(line) - len(line.lstrip())
+        info.last_code = len(code) - 1
+        if "{" not in code and "}" not in code:
+            self._content()
+            info.depth = len(self.stack)
+            self.previous_char, self.previous_line = code[-1], line_number
+            return info
+
+        leading = True
+        segment_start = 0
+        for match in BRACE_PATTERN.finditer(code):
+            start = match.start()
+            if code[segment_start:start].strip():
+                self._content()
+            before = code[info.first_code:start]
+            if leading and before.replace("}", "").strip():
+                leading = False
+                info.depth = len(self.stack)
+
+            if match.group() == "{":
+                if before.strip():
+                    self.previous_char, self.previous_line = before.rstrip()[-1], line_number
+                if leading:
+                    leading = False
+                    info.depth = len(self.stack)
+                self._open(line_number, start)
+            else:
+                self._close(line_number, start)
+            self.previous_char, self.previous_line = match.group(), line_number
+            segment_start = start + 1
+
+        if code[segment_start:].strip():
+            self._content()
+        if leading:
+            info.depth = len(self.stack)
+        self.previous_char, self.previous_line = code[-1], line_number
+        return info
+
+    def scan_line(self, line_number: int, line: str):
+        if not (self.in_block_comment or self.in_text_block or LITERAL_OR_COMMENT.search(line)):
+            self.lines.append(self._scan_plain(line_number, line))
+            return
+
+        info = LineInfo(in_text_block=self.in_text_block)
+        leading = True
+        pos = 0
+
+        while pos < len(line):
+            if self.in_block_comment:
+                end = line.find("*/", pos)
+                if end == -1:
+                    break
+                self.in_block_comment = False
+                pos = end + 2
+                continue
+
+            if self.in_text_block:
+                match = TEXT_BLOCK_END.search(line, pos)
+                if not match:
+                    break
+                self.in_text_block = False
+                pos = match.end()
+                # The closing delimiter is code
+                if info.first_code is None:
+                    info.first_code = match.start()
+                info.last_code = pos - 1
+                if leading:
+                    leading = False
+                    info.depth = len(self.stack)
+                self.previous_char, self.previous_line = '"', line_number
+                continue
+
+            match = TOKEN_PATTERN.search(line, pos)
+            if not match:
+                break
+            kind = match.lastgroup
+            start, end = match.span()
+
+            if kind == "line_comment":
+                self._content()
+                break
+            if kind == "block_comment":
+                self._content()
+                self.in_block_comment = True
+                pos = end
+                continue
+
+            if info.first_code is None:
+                info.first_code = start
+            info.last_code = end - 1
+
+            if kind == "text_block":
+                self._content()
+                self.in_text_block = True
+            elif kind == "brace" and match.group() == "{":
+                self._open(line_number, start)
+            elif kind == "brace":
+                self._close(line_number, start)
+            else:
+                self._content()
+
+            if leading and not (kind == "brace" and match.group() == "}"):
+                leading = False
+                info.depth = len(self.stack) - (1 if kind == "brace" else 0)
+            self.previous_char, self.previous_line = line[end - 1], line_number
+            pos = end
+
+        if leading:
+            # Blank, comment-only or closing-braces-only line
+            info.depth = len(self.stack)
+        self.lines.append(info)
+
+
+@lru_cache(maxsize=1)
+def build_scope_tree(code: str) -> ScopeTree:
+    """
+    Parse the block structure of code once.
+
+    Cached on the code itself, so every block-aware rule run on the same
+    file shares one pass.
+
+    Args:
+        code: Java source
+
+    Returns:
+        ScopeTree with per-line info (indexed by line number - 1) and blocks
+    """
+    scanner = _Scanner()
+    for line_number, line in enumerate(code.splitlines(), start=1):
+        scanner.scan_line(line_number, line)
+    return ScopeTree(scanner.lines, scanner.blocks, scanner.roots)
+
+
+def starts_with_else(line: str, info: LineInfo) -> bool:
+    return info.first_code is not None and ELSE_PATTERN.match(line, info.first_code) is not None
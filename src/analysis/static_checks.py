@@ -1,4 +1,5 @@
 import re
+from src.analysis.scope_tree import STANDALONE_PRECEDERS, build_scope_tree, starts_with_else
 from src.reviewer.models import StyleComment
 from src.rules.rule_definitions import Rule
 
@@ -126,12 +127,20 @@ def check_trailing_whitespace(file_path: str, code: str, rule: Rule):
 # ---------- Brace on same line ----------
 def check_brace_same_line(file_path: str, code: str, rule: Rule):
     comments = []
-    lines = code.splitlines()
-
-    for i in range(len(lines) - 1):
-        if lines[i].strip().endswith((")", "else")) and lines[i + 1].strip() == "{":
+    tree = build_scope_tree(code)
+
+    for block in tree.blocks:
+        # A "{" that starts its line while the statement it belongs to is on
+        # an earlier line; standalone blocks and initializers are exempt
+        if (
+            not block.is_initializer
+            and block.preceded_by is not None
+            and block.preceded_by not in STANDALONE_PRECEDERS
+            and block.preceded_on_line < block.open_line
+            and tree.lines[block.open_line - 1].first_code == block.open_column
+        ):
             comments.append(
-                StyleComment(file_path, i + 2, 0, rule.id, rule.message, rule.severity)
+                StyleComment(file_path, block.open_line, 0, rule.id, rule.message, rule.severity)
             )
     return comments
 
@@ -156,21 +165,17 @@ def check_one_statement_per_line(file_path: str, code: str, rule: Rule):
 # ---------- Indentation ----------
 def check_indentation(file_path: str, code: str, rule: Rule):
     comments = []
-    indent_level = 0
-
-    for i, line in enumerate(code.splitlines(), start=1):
-        stripped = line.strip()
+    tree = build_scope_tree(code)
 
-        if stripped.startswith("}"):
-            indent_level = max(indent_level - 1, 0)
+    for i, (line, info) in enumerate(zip(code.splitlines(), tree.lines), start=1):
+        # Leading whitespace inside a text block is part of the string
+        if info.in_text_block:
+            continue
 
-        if stripped and not line.startswith(" " * (indent_level * 4)):
+        if line.strip() and not line.startswith(" " * (info.depth * 4)):
             comments.append(
                 StyleComment(file_path, i, 0, rule.id, rule.message, rule.severity)
             )
-
-        if stripped.endswith("{"):
-            indent_level += 1
     return comments
 
 # ---------- Class naming ----------
@@ -224,36 +229,55 @@ def check_boolean_naming(file_path: str, code: str, rule: Rule):
 def check_else_same_line(file_path, code, rule):
     comments = []
     lines = code.splitlines()
+    tree = build_scope_tree(code)
+
+    for i, (line, info) in enumerate(zip(lines, tree.lines), start=1):
+        if not starts_with_else(line, info):
+            continue
 
-    for i in range(len(lines) - 1):
-        if lines[i].strip() == "}" and lines[i + 1].strip().startswith("else"):
+        previous = tree.previous_code_line(i)
+        if previous is not None and lines[previous - 1][tree.lines[previous - 1].last_code] == "}":
             comments.append(
-                StyleComment(file_path, i + 2, 0, rule.id, rule.message, rule.severity)
+                StyleComment(file_path, i, 0, rule.id, rule.message, rule.severity)
             )
     return comments
 
 # ---------- Empty block detection ----------
 def check_empty_block(file_path, code, rule):
     comments = []
-    lines = code.splitlines()
+    tree = build_scope_tree(code)
 
-    for i in range(len(lines) - 1):
-        if lines[i].strip().endswith("{") and lines[i + 1].strip() == "}":
+    for block in tree.blocks:
+        # Single-line "{}" (e.g. a default constructor) and empty array
+        # initializers are left alone, as are blocks holding only a comment
+        if block.is_empty and not block.is_initializer and (block.close_line or 0) > block.open_line:
             comments.append(
-                StyleComment(file_path, i + 1, 0, rule.id, rule.message, rule.severity)
+                StyleComment(file_path, block.open_line, 0, rule.id, rule.message, rule.severity)
             )
     return comments
 
 # ---------- Multiple variable declaration detection ----------
+# "(?=(X))\N" is an atomic group that works before Python 3.11 (no "++"/"*+"):
+# a failed match gives nothing back, so a long line costs one pass per type
+# keyword instead of backtracking between the name and the rest. The
+# declaration may not run past a ';'
+MULTIPLE_VAR_DECL_PATTERN = re.compile(
+    r'\b(?:int|double|float|String|boolean|char)\s+'
+    r'(?=(?P<name>\w+))(?P=name)(?=(?P<rest>[^,;]*))(?P=rest)(?P<comma>,)'
+)
+
+
 def check_multiple_var_declaration(file_path, code, rule):
     comments = []
-    pattern = re.compile(r'\b(int|double|float|String|boolean|char)\s+\w+.*(,).*(?=;)')
-
     for i, line in enumerate(code.splitlines(), start=1):
-        match = pattern.search(line)
+        # The declaration must be terminated on this line
+        end = line.rfind(";")
+        if end == -1:
+            continue
+        match = MULTIPLE_VAR_DECL_PATTERN.search(line, 0, end)
         if match:
             comments.append(
-                StyleComment(file_path, i, match.start(2) + 1, rule.id, rule.message, rule.severity)
+                StyleComment(file_path, i, match.start("comma") + 1, rule.id, rule.message, rule.severity)
             )
     return comments
 
@@ -0,0 +1,196 @@
+"""
+Optional NumPy backend for whole-file line checks.
+
+Line length, trailing whitespace, tabs, indentation and end-of-file
+newline only need per-line metrics. These are computed once per file as
+NumPy arrays directly from the code points (no per-line Python loop) and
+each rule becomes a boolean mask. Indentation is the exception: its
+expected depth per line comes from the shared scope tree, which is built
+by a per-line Python pass. Results are identical to the checkers
+in static_checks.py; files using line separators other than \\n, \\r\\n
+and \\r fall back to those checkers.
+
+Enable with STATIC_BACKEND=numpy. NumPy is not a hard dependency.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.analysis import static_checks
+from src.analysis.scope_tree import build_scope_tree
+from src.reviewer.models import StyleComment
+from src.rules.rule_definitions import Rule
+
+# str.splitlines() separators other than \n and \r
+OTHER_LINE_SEPARATORS = re.compile("[\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+ASCII_LINE_SEPARATORS = "\v\f\x1c\x1d\x1e"
+# Every code point for which str.isspace() is true, minus the separators above
+WHITESPACE = [
+    0x09, 0x0A, 0x0D, 0x1F, 0x20, 0xA0, 0x1680, *range(0x2000, 0x200B), 0x202F, 0x205F, 0x3000,
+]
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+@dataclass
+class LineMetrics:
+    count: int
+    lengths: "np.ndarray"
+    has_content: "np.ndarray"
+    rstripped_lengths: "np.ndarray"
+    leading_spaces: "np.ndarray"
+    has_tab: "np.ndarray"
+    tab_columns: "np.ndarray"
+
+
+def _first_in_range(indices, starts, ends):
+    """For each [start, end) range, whether sorted indices has an entry inside it, and the first one"""
+    if len(indices) == 0:
+        return np.zeros(len(starts), dtype=bool), np.zeros(len(starts), dtype=np.int64)
+    pos = np.searchsorted(indices, starts)
+    first = indices[np.minimum(pos, len(indices) - 1)]
+    return (pos < len(indices)) & (first < ends), first
+
+
+def _last_in_range(indices, starts, ends):
+    """For each [start, end) range, the last entry of sorted indices inside it"""
+    if len(indices) == 0:
+        return np.zeros(len(starts), dtype=bool), np.zeros(len(starts), dtype=np.int64)
+    pos = np.searchsorted(indices, ends) - 1
+    last = indices[np.maximum(pos, 0)]
+    return (pos >= 0) & (last >= starts), last
+
+
+def _shifted(mask, offset: int):
+    """mask moved by offset positions, padded with True (line boundaries count as whitespace)"""
+    out = np.ones_like(mask)
+    if offset > 0:
+        out[offset:] = mask[:-offset]
+    else:
+        out[:offset] = mask[-offset:]
+    return out
+
+
+@lru_cache(maxsize=1)
+def line_metrics(code: str) -> LineMetrics:
+    text = code.replace("\r\n", "\n").replace("\r", "\n") if "\r" in code else code
+    if text.isascii():
+        chars = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        other = (chars == 0x09) | (chars == 0x1F)
+        whitespace = other | (chars == 0x20) | (chars == 0x0A)
+    else:
+        chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        whitespace = np.isin(chars, WHITESPACE)
+        other = whitespace & (chars != 0x20) & (chars != 0x0A)
+
+    newlines = np.flatnonzero(chars == 0x0A)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(chars)]))
+    if len(chars) == 0 or chars[-1] == 0x0A:
+        # splitlines() yields no trailing empty line
+        starts, ends = starts[:-1], ends[:-1]
+
+    # Only token boundaries are indexed: the first content character of a
+    # line starts a token and the last one ends a token
+    content = ~whitespace
+    token_starts = np.flatnonzero(content & _shifted(whitespace, 1))
+    token_ends = np.flatnonzero(content & _shifted(whitespace, -1))
+    has_content, first_content = _first_in_range(token_starts, starts, ends)
+    _, last_content = _last_in_range(token_ends, starts, ends)
+
+    # Leading spaces end at the first content character, or earlier at a
+    # tab or other non-space whitespace (rare, so this index stays small)
+    has_other, first_other = _first_in_range(np.flatnonzero(other), starts, ends)
+    first_non_space = np.where(has_content, first_content, ends)
+    first_non_space = np.where(has_other, np.minimum(first_non_space, first_other), first_non_space)
+    leading_spaces = first_non_space - starts
+
+    tabs = np.flatnonzero(chars == 0x09)
+    has_tab, first_tab = _first_in_range(tabs, starts, ends)
+
+    return LineMetrics(
+        count=len(starts),
+        lengths=ends - starts,
+        has_content=has_content,
+        rstripped_lengths=np.where(has_content, last_content - starts + 1, 0),
+        leading_spaces=leading_spaces,
+        has_tab=has_tab,
+        tab_columns=first_tab - starts,
+    )
+
+
+def _comments(file_path: str, rule: Rule, mask, positions) -> list[StyleComment]:
+    line_numbers = np.flatnonzero(mask) + 1
+    positions = np.broadcast_to(positions, mask.shape)[mask]
+    return [
+        StyleComment(file_path, int(line), int(position), rule.id, rule.message, rule.severity)
+        for line, position in zip(line_numbers.tolist(), positions.tolist())
+    ]
+
+
+def _fallback(code: str) -> bool:
+    # Substring tests are much cheaper than a regex scan of a large file
+    if any(sep in code for sep in ASCII_LINE_SEPARATORS):
+        return True
+    return not code.isascii() and OTHER_LINE_SEPARATORS.search(code) is not None
+
+
+def check_line_length(file_path: str, code: str, rule: Rule, max_length: int = 120):
+    if _fallback(code):
+        return static_checks.check_line_length(file_path, code, rule, max_length)
+    m = line_metrics(code)
+    return _comments(file_path, rule, m.lengths > max_length, max_length + 1)
+
+
+def check_trailing_whitespace(file_path: str, code: str, rule: Rule):
+    if _fallback(code):
+        return static_checks.check_trailing_whitespace(file_path, code, rule)
+    m = line_metrics(code)
+    mask = m.has_content & (m.rstripped_lengths < m.lengths)
+    return _comments(file_path, rule, mask, m.rstripped_lengths + 1)
+
+
+def check_tabs_used(file_path: str, code: str, rule: Rule):
+    if _fallback(code):
+        return static_checks.check_tabs_used(file_path, code, rule)
+    m = line_metrics(code)
+    return _comments(file_path, rule, m.has_tab, m.tab_columns)
+
+
+def check_indentation(file_path: str, code: str, rule: Rule):
+    if _fallback(code):
+        return static_checks.check_indentation(file_path, code, rule)
+    m = line_metrics(code)
+    tree = build_scope_tree(code)
+
+    depths = np.fromiter((info.depth for info in tree.lines), dtype=np.int64, count=m.count)
+    in_text_block = np.fromiter((info.in_text_block for info in tree.lines), dtype=bool, count=m.count)
+    mask = m.has_content & ~in_text_block & (m.leading_spaces < depths * 4)
+    return _comments(file_path, rule, mask, 0)
+
+
+def check_file_end_newline(file_path: str, code: str, rule: Rule):
+    if _fallback(code):
+        return static_checks.check_file_end_newline(file_path, code, rule)
+    if code.endswith(("\n", "\r\n")):
+        return []
+    # Same count as splitlines(): a trailing lone \r ends the last line
+    breaks = code.count("\n") + code.count("\r") - code.count("\r\n")
+    line_count = breaks + 1 - code.endswith("\r") if code else 0
+    return [StyleComment(file_path, line_count + 1, 0, rule.id, rule.message, rule.severity)]
+
+
+VECTORIZED_CHECKERS = {
+    "JAVA_LINE_LENGTH": check_line_length,
+    "JAVA_TRAILING_WHITESPACE": check_trailing_whitespace,
+    "JAVA_TABS_USED": check_tabs_used,
+    "JAVA_INDENTATION": check_indentation,
+    "JAVA_FILE_END_NEWLINE": check_file_end_newline,
+}
@@ -1,27 +1,70 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
 from src.llm.config import load_config
 from src.llm.providers import get_provider
 
 
 class LLMClient:
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", cache_dir: Optional[str] = None):
         """
         Initialize LLM client from config file.
-        
+
         Args:
             config_path: Path to config.yaml file
+            cache_dir: Directory for cached responses (defaults to LLM_CACHE_DIR;
+                no caching if neither is set)
         """
         self.config = load_config(config_path)
         self.provider = get_provider(self.config)
+        self.cache_dir = cache_dir or os.getenv("LLM_CACHE_DIR") or None
 
-    def review(self, prompt: str, code: str) -> str:
+    def _cache_path(self, identity: list, prompt: str, code: str, json_mode: bool) -> str:
+        # Everything that changes the response is part of the key, including
+        # which backend answers (under routing, not necessarily the configured model)
+        key_data = [identity, json_mode, prompt, code]
+        key = hashlib.sha256(json.dumps(key_data).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def review(self, prompt: str, code: str, json_mode: bool = False) -> str:
         """
         Returns raw LLM text output.
-        
+
+        With a cache directory, identical requests (same model settings,
+        prompt and code) are answered from disk, so the cache can be shared
+        between local runs and CI. Responses are stored under the model
+        that actually answered, so a routing fallback's reply is never
+        served in place of the routed backend's.
+
         Args:
             prompt: System prompt with instructions
             code: Code snippet to review
-            
+            json_mode: Request a JSON object response from the provider
+
         Returns:
             LLM response text
         """
-        return self.provider.call(prompt, code)
+        if not self.cache_dir:
+            return self.provider.call(prompt, code, json_mode=json_mode)
+
+        path = self._cache_path(self.provider.cache_identity(code), prompt, code, json_mode)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            pass
+
+        response, identity = self.provider.call_with_identity(prompt, code, json_mode=json_mode)
+        path = self._cache_path(identity, prompt, code, json_mode)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial entry
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(response)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write LLM cache entry: {e}")
+        return response
@@ -5,9 +5,10 @@ Supports environment variable overrides for CI/CD.
 """
 
 import os
-import yaml
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from src.rules.rule_loader import load_yaml
 
 
 @dataclass
@@ -19,6 +20,38 @@ class LLMConfig:
     base_url: Optional[str] = None
     temperature: float = 0.7
     max_tokens: int = 1000
+    structured_output: bool = False
+    # Concurrent requests allowed to this backend (used by the router)
+    max_concurrency: int = 4
+    # Set when provider is "router"
+    router: Optional["RouterConfig"] = None
+
+
+@dataclass
+class Route:
+    """Send files up to max_lines lines and max_complexity branches to backend"""
+    backend: str
+    max_lines: Optional[int] = None
+    max_complexity: Optional[int] = None
+
+
+@dataclass
+class RouterConfig:
+    routes: list[Route]
+    backends: dict[str, LLMConfig] = field(default_factory=dict)
+    # Backend used when the routed one is throttled, saturated or unreachable
+    fallback: Optional[str] = None
+    # Seconds to wait for a free slot on the routed backend before falling back
+    queue_timeout: float = 5.0
+    # Seconds a backend is avoided after it answered 429 without Retry-After
+    throttle_cooldown: float = 30.0
+
+
+def _parse_bool(value) -> bool:
+    """Interpret YAML booleans and env var strings alike"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
 
 
 def load_config(config_path: str = "/action/config.yaml") -> LLMConfig:
@@ -26,9 +59,12 @@ def load_config(config_path: str = "/action/config.yaml") -> LLMConfig:
     Load LLM configuration from YAML file with environment variable overrides.
     
     Environment variables:
-    - LLM_PROVIDER: Override provider (openai)
+    - LLM_PROVIDER: Override provider (openai, or router to route across backends)
     - {PROVIDER}_API_KEY: e.g., OPENAI_API_KEY
     - {PROVIDER}_MODEL: e.g., OPENAI_MODEL
+    - {PROVIDER}_STRUCTURED_OUTPUT: e.g., OPENAI_STRUCTURED_OUTPUT=true
+    - {PROVIDER}_MAX_CONCURRENCY: e.g., LOCAL_MAX_CONCURRENCY=1
+    - ROUTER_FALLBACK: Override the router's fallback backend
     
     Args:
         config_path: Path to config.yaml file
@@ -43,47 +79,117 @@ def load_config(config_path: str = "/action/config.yaml") -> LLMConfig:
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with open(config_path, "r") as f:
-        config_data = yaml.safe_load(f)
+    config_data = load_yaml(config_path)
     
     if not config_data:
         raise ValueError("Config file is empty")
     
     # Check for env var override of provider
     active_provider = os.getenv("LLM_PROVIDER", config_data.get("provider", "openai")).lower()
-    
+
+    if active_provider == "router":
+        return _load_router_config(config_data)
+
     if active_provider not in config_data:
         raise ValueError(f"Provider '{active_provider}' not found in config")
-    
-    provider_config = config_data[active_provider]
-    
+
+    return _load_provider_config(active_provider, config_data[active_provider])
+
+
+def _load_provider_config(name: str, provider_config: dict) -> LLMConfig:
+    """
+    Build one provider's config from its section.
+
+    A section may set `type` to reuse a provider implementation under
+    another name (e.g. a local llama.cpp server with type: openai).
+    Environment variables use the section name: {NAME}_MODEL etc.
+    """
     # Build unified config from provider-specific settings
     # Environment variables override YAML
-    provider_upper = active_provider.upper()
-    
+    provider_upper = name.upper()
+    provider_type = provider_config.get("type", name).lower()
+
     llm_config = LLMConfig(
-        provider=active_provider,
+        provider=provider_type,
         model=os.getenv(f"{provider_upper}_MODEL", provider_config.get("model")),
         api_key=os.getenv(f"{provider_upper}_API_KEY", provider_config.get("api_key")),
         base_url=os.getenv(f"{provider_upper}_BASE_URL", provider_config.get("base_url")),
         temperature=float(os.getenv(f"{provider_upper}_TEMPERATURE", provider_config.get("temperature", 0.7))),
         max_tokens=int(os.getenv(f"{provider_upper}_MAX_TOKENS", provider_config.get("max_tokens", 1000))),
+        structured_output=_parse_bool(
+            os.getenv(f"{provider_upper}_STRUCTURED_OUTPUT", provider_config.get("structured_output", False))
+        ),
+        max_concurrency=int(os.getenv(f"{provider_upper}_MAX_CONCURRENCY", provider_config.get("max_concurrency", 4))),
     )
     
     # Validate required fields
     if not llm_config.model:
-        raise ValueError(f"Model not specified for provider '{active_provider}'")
+        raise ValueError(f"Model not specified for provider '{name}'")
     
-    if active_provider in ["openai"]:
+    # Self-hosted OpenAI-compatible servers (base_url set) usually need no key
+    if provider_type in ["openai"] and not llm_config.base_url:
         if not llm_config.api_key or "placeholder" in llm_config.api_key.lower():
             raise ValueError(
-                f"API key not configured for {active_provider}. "
+                f"API key not configured for {name}. "
                 f"Set environment variable {provider_upper}_API_KEY or update config.yaml"
             )
     
     return llm_config
 
 
+def _load_router_config(config_data: dict) -> LLMConfig:
+    """
+    Build the routing provider's config from the `router` section.
+
+    Example:
+        provider: router
+        router:
+          routes:
+            - backend: small
+              max_lines: 150
+            - backend: large
+          fallback: local
+        small: {type: openai, model: gpt-4o-mini}
+        large: {type: openai, model: gpt-4o}
+        local: {type: openai, model: qwen2.5-coder, base_url: http://localhost:8080/v1}
+
+    Raises:
+        ValueError: If the section is missing or references unknown backends
+    """
+    router_data = config_data.get("router")
+    if not router_data or not router_data.get("routes"):
+        raise ValueError("Provider 'router' requires a router section with at least one route")
+
+    routes = [
+        Route(backend=r["backend"], max_lines=r.get("max_lines"), max_complexity=r.get("max_complexity"))
+        for r in router_data["routes"]
+    ]
+    fallback = os.getenv("ROUTER_FALLBACK", router_data.get("fallback")) or None
+
+    backends = {}
+    for name in [r.backend for r in routes] + ([fallback] if fallback else []):
+        if name in backends:
+            continue
+        if name not in config_data:
+            raise ValueError(f"Router backend '{name}' not found in config")
+        backends[name] = _load_provider_config(name, config_data[name])
+
+    router = RouterConfig(
+        routes=routes,
+        backends=backends,
+        fallback=fallback,
+        queue_timeout=float(router_data.get("queue_timeout", 5.0)),
+        throttle_cooldown=float(router_data.get("throttle_cooldown", 30.0)),
+    )
+    return LLMConfig(
+        provider="router",
+        model="router",
+        max_tokens=max(b.max_tokens for b in backends.values()),
+        structured_output=_parse_bool(router_data.get("structured_output", False)),
+        router=router,
+    )
+
+
 def get_config() -> LLMConfig:
     """
     Convenience function to load config from default location.
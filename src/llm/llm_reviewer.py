@@ -1,9 +1,20 @@
-from src.llm.prompts import LLM_REVIEW_PROMPT
+from typing import Optional
+
+from src.llm.prompts import LLM_REVIEW_PROMPT, LLM_REVIEW_JSON_PROMPT
+from src.llm.structured_output import StructuredOutputError, parse_findings
 from src.reviewer.models import StyleComment, Source
 from src.llm.client import LLMClient
 from src.rules.rule_definitions import Rule
 
 
+def build_review_prompt(rules: list[Rule], structured_output: bool) -> str:
+    """System prompt sent for a review: the JSON prompt lists the rules"""
+    if not structured_output:
+        return LLM_REVIEW_PROMPT.strip()
+    rule_lines = "\n".join(f"- {r.id}: {r.description}" for r in rules)
+    return LLM_REVIEW_JSON_PROMPT.format(rules=rule_lines).strip()
+
+
 class LLMReviewer:
     def __init__(self, client: LLMClient):
         self.client = client
@@ -26,15 +37,24 @@ class LLMReviewer:
         # Default to method name intent for other semantic issues
         return "LLM_METHOD_NAME_INTENT"
 
-    def review(self, file_path: str, code: str, rules: list[Rule]) -> list[StyleComment]:
-        comments = []
+    def _build_comment(self, file_path: str, line_number: int, position: int,
+                       rule_id: str, message: str, rules: list[Rule]):
+        matching_rule = next((r for r in rules if r.id == rule_id), None)
+        if not matching_rule:
+            return None
 
-        prompt = LLM_REVIEW_PROMPT.strip()
-        
-        # Add line numbers to code for LLM clarity
-        numbered_code = "\n".join(f"{i+1}: {line}" for i, line in enumerate(code.splitlines()))
-        
-        response = self.client.review(prompt, numbered_code)
+        return StyleComment(
+            file_path=file_path,
+            line_number=line_number,
+            position=position,
+            rule_id=rule_id,
+            message=message.strip(),
+            severity=matching_rule.severity,
+            source=Source.LLM,
+        )
+
+    def _parse_text_response(self, file_path: str, response: str, rules: list[Rule]) -> list[StyleComment]:
+        comments = []
 
         if response.strip() == "No issues found.":
             return comments
@@ -52,19 +72,57 @@ class LLMReviewer:
 
             # Classify the issue and find matching rule
             rule_id = self._classify_issue(message)
-            matching_rule = next((r for r in rules if r.id == rule_id), None)
-            
-            if matching_rule:
-                comments.append(
-                    StyleComment(
-                        file_path=file_path,
-                        line_number=line_number,
-                        position=position,
-                        rule_id=rule_id,
-                        message=message.strip(),
-                        severity=matching_rule.severity,
-                        source=Source.LLM,
-                    )
-                )
+            comment = self._build_comment(file_path, line_number, position, rule_id, message, rules)
+            if comment:
+                comments.append(comment)
 
         return comments
+
+    def _parse_structured_response(self, file_path: str, response: str, rules: list[Rule],
+                                   line_count: Optional[int] = None) -> list[StyleComment]:
+        """
+        Parse a JSON findings response.
+
+        Rule IDs come straight from the model; unknown IDs fall back to
+        keyword classification of the message. Findings past line_count
+        (a line the file does not have) are dropped.
+
+        Raises:
+            StructuredOutputError: If the response is not a findings document
+        """
+        comments = []
+        known_ids = {r.id for r in rules}
+
+        for finding in parse_findings(response):
+            if line_count is not None and finding.line > line_count:
+                continue
+            rule_id = finding.rule_id
+            if rule_id not in known_ids:
+                rule_id = self._classify_issue(finding.message)
+
+            comment = self._build_comment(
+                file_path, finding.line, finding.column, rule_id, finding.message, rules
+            )
+            if comment:
+                comments.append(comment)
+
+        return comments
+
+    def review(self, file_path: str, code: str, rules: list[Rule]) -> list[StyleComment]:
+        # Add line numbers to code for LLM clarity
+        lines = code.splitlines()
+        numbered_code = "\n".join(f"{i+1}: {line}" for i, line in enumerate(lines))
+
+        prompt = build_review_prompt(rules, self.client.config.structured_output)
+        if not self.client.config.structured_output:
+            response = self.client.review(prompt, numbered_code)
+            return self._parse_text_response(file_path, response, rules)
+
+        response = self.client.review(prompt, numbered_code, json_mode=True)
+
+        try:
+            return self._parse_structured_response(file_path, response, rules, len(lines))
+        except StructuredOutputError as e:
+            # Reuse the response we already paid for instead of re-requesting
+            print(f"Warning: Structured LLM output invalid, falling back to text parsing: {e}")
+            return self._parse_text_response(file_path, response, rules)
@@ -16,3 +16,21 @@ RESPOND in ONLY this format:
 
 Be concise and specific.
 """
+
+LLM_REVIEW_JSON_PROMPT = """You are a senior Java code reviewer focusing on semantic issues.
+
+Review the following Java code fragment STRICTLY for these rules:
+{rules}
+
+DO NOT comment on:
+- Formatting, spacing, indentation, brace style, line length
+- Static analysis issues (those are caught separately)
+
+RESPOND with ONLY a JSON object of this shape:
+{{"findings": [{{"rule_id": "<rule id>", "line": <number>, "column": <number>, "message": "<issue>"}}]}}
+
+Use one of the rule ids listed above for every finding.
+If no issues found, respond: {{"findings": []}}
+
+Be concise and specific.
+"""
@@ -1,16 +1,22 @@
 """
 LLM Provider implementations.
-Supports: OpenAI, Gemini, Claude, and local LLM servers.
+Supports: OpenAI and OpenAI-compatible servers (Azure OpenAI, local
+llama.cpp or vLLM servers), and routing between several of them.
 """
 
 from abc import ABC, abstractmethod
 import json
 import re
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
-import requests
 from src.llm.config import LLMConfig
 
+# Rough cyclomatic complexity: branch points in the code
+BRANCH_PATTERN = re.compile(r'\b(?:if|for|while|case|catch)\b|&&|\|\|')
+
 
 class BaseLLMProvider(ABC):
     """Base class for all LLM providers"""
@@ -22,19 +28,28 @@ class BaseLLMProvider(ABC):
         self.max_tokens = config.max_tokens
     
     @abstractmethod
-    def call(self, prompt: str, code: str) -> str:
+    def call(self, prompt: str, code: str, json_mode: bool = False) -> str:
         """
         Make a request to the LLM.
         
         Args:
             prompt: System prompt/instructions
             code: Code snippet to review
+            json_mode: Ask the provider to constrain output to a JSON object
             
         Returns:
             LLM response text
         """
         pass
 
+    def cache_identity(self, code: str) -> list:
+        """Settings of the model that will answer a request for code, for response cache keys"""
+        return [self.config.provider, self.model, self.config.base_url, self.temperature, self.max_tokens]
+
+    def call_with_identity(self, prompt: str, code: str, json_mode: bool = False) -> tuple[str, list]:
+        """Like call, also returning the cache_identity of the model that actually answered"""
+        return self.call(prompt, code, json_mode=json_mode), self.cache_identity(code)
+
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI API provider (including Azure OpenAI compatible endpoints)"""
@@ -44,8 +59,12 @@ class OpenAIProvider(BaseLLMProvider):
         self.api_key = config.api_key
         self.base_url = config.base_url or "https://api.openai.com/v1"
     
-    def call(self, prompt: str, code: str) -> str:
+    def call(self, prompt: str, code: str, json_mode: bool = False) -> str:
         """Call OpenAI API"""
+        # Imported lazily: requests dominates interpreter startup and is
+        # only needed once a request is actually made
+        import requests
+
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -63,6 +82,8 @@ class OpenAIProvider(BaseLLMProvider):
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
         }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
         
         response = requests.post(
             f"{self.base_url}/chat/completions",
@@ -75,6 +96,178 @@ class OpenAIProvider(BaseLLMProvider):
         result = response.json()
         return result["choices"][0]["message"]["content"]
 
+class BackendSaturated(Exception):
+    """No free concurrency slot on a backend within the queue timeout"""
+
+
+@dataclass
+class BackendStats:
+    calls: int = 0
+    failures: int = 0
+    throttled: int = 0
+    fallback_calls: int = 0
+    peak_in_flight: int = 0
+    total_seconds: float = 0.0
+    # Exponentially weighted moving average of successful call latency
+    ewma_seconds: Optional[float] = None
+
+
+class _Backend:
+    def __init__(self, name: str, provider: BaseLLMProvider, max_concurrency: int):
+        self.name = name
+        self.provider = provider
+        self.slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self.lock = threading.Lock()
+        self.stats = BackendStats()
+        self.in_flight = 0
+        self.throttled_until = 0.0
+
+    def is_throttled(self) -> bool:
+        return time.monotonic() < self.throttled_until
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    return getattr(getattr(error, "response", None), "status_code", None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _should_fall_back(error: Exception) -> bool:
+    """Throttling, server errors and connection problems; not bad requests"""
+    if isinstance(error, BackendSaturated):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+
+    import requests
+
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def estimate_complexity(code: str) -> int:
+    return len(BRANCH_PATTERN.findall(code))
+
+
+class RoutingProvider(BaseLLMProvider):
+    """
+    Routes each request to a backend by file size and complexity.
+
+    Routes are tried in order; the first whose max_lines and
+    max_complexity both fit is used (the last route catches the rest).
+    Each backend has its own concurrency limit. If the routed backend is
+    throttled (HTTP 429), saturated for longer than queue_timeout, failing
+    with server errors or unreachable, the request goes to the fallback
+    backend, typically a local OpenAI-compatible server.
+    """
+
+    def __init__(self, config: LLMConfig):
+        super().__init__(config)
+        self.router = config.router
+        self.backends = {
+            name: _Backend(name, get_provider(backend_config), backend_config.max_concurrency)
+            for name, backend_config in self.router.backends.items()
+        }
+
+    def route(self, code: str) -> str:
+        """Name of the backend a file is routed to"""
+        line_count = len(code.splitlines())
+        complexity = None
+        for route in self.router.routes:
+            if route.max_lines is not None and line_count > route.max_lines:
+                continue
+            if route.max_complexity is not None:
+                if complexity is None:
+                    complexity = estimate_complexity(code)
+                if complexity > route.max_complexity:
+                    continue
+            return route.backend
+        return self.router.routes[-1].backend
+
+    def _call_backend(self, backend: _Backend, prompt: str, code: str, json_mode: bool,
+                      queue_timeout: Optional[float]) -> str:
+        if not backend.slots.acquire(timeout=queue_timeout):
+            raise BackendSaturated(f"no free slot on backend '{backend.name}'")
+
+        with backend.lock:
+            backend.in_flight += 1
+            backend.stats.peak_in_flight = max(backend.stats.peak_in_flight, backend.in_flight)
+
+        start = time.monotonic()
+        try:
+            response = backend.provider.call(prompt, code, json_mode=json_mode)
+        except Exception as e:
+            with backend.lock:
+                backend.stats.failures += 1
+                if _status_code(e) == 429:
+                    backend.stats.throttled += 1
+                    cooldown = _retry_after(e) or self.router.throttle_cooldown
+                    backend.throttled_until = time.monotonic() + cooldown
+            raise
+        finally:
+            with backend.lock:
+                backend.in_flight -= 1
+            backend.slots.release()
+
+        elapsed = time.monotonic() - start
+        with backend.lock:
+            stats = backend.stats
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.ewma_seconds = elapsed if stats.ewma_seconds is None else 0.8 * stats.ewma_seconds + 0.2 * elapsed
+        return response
+
+    def _call(self, prompt: str, code: str, json_mode: bool) -> tuple[str, _Backend]:
+        primary = self.backends[self.route(code)]
+        fallback = self.backends.get(self.router.fallback)
+        if fallback is None or fallback is primary:
+            return self._call_backend(primary, prompt, code, json_mode, None), primary
+
+        if not primary.is_throttled():
+            try:
+                return self._call_backend(primary, prompt, code, json_mode, self.router.queue_timeout), primary
+            except Exception as e:
+                if not _should_fall_back(e):
+                    raise
+                print(f"Warning: backend '{primary.name}' unavailable ({e}); using '{fallback.name}'")
+
+        with fallback.lock:
+            fallback.stats.fallback_calls += 1
+        return self._call_backend(fallback, prompt, code, json_mode, None), fallback
+
+    def call(self, prompt: str, code: str, json_mode: bool = False) -> str:
+        return self._call(prompt, code, json_mode)[0]
+
+    def cache_identity(self, code: str) -> list:
+        """Identity of the routed backend; a fallback answer is cached under the fallback's own"""
+        backend = self.backends[self.route(code)]
+        return [backend.name, *backend.provider.cache_identity(code)]
+
+    def call_with_identity(self, prompt: str, code: str, json_mode: bool = False) -> tuple[str, list]:
+        response, backend = self._call(prompt, code, json_mode)
+        return response, [backend.name, *backend.provider.cache_identity(code)]
+
+    def report(self) -> list[str]:
+        """One line of call counts and latency per backend"""
+        lines = []
+        for name, backend in self.backends.items():
+            s = backend.stats
+            mean = s.total_seconds / s.calls if s.calls else 0.0
+            ewma = s.ewma_seconds or 0.0
+            lines.append(
+                f"{name}: {s.calls} call(s) ({s.fallback_calls} as fallback), mean {mean:.2f}s, "
+                f"recent {ewma:.2f}s, peak {s.peak_in_flight} concurrent, "
+                f"{s.failures} failure(s), {s.throttled} throttled"
+            )
+        return lines
+
+
 def get_provider(config: LLMConfig) -> BaseLLMProvider:
     """
     Factory function to get the appropriate LLM provider.
@@ -89,7 +282,8 @@ def get_provider(config: LLMConfig) -> BaseLLMProvider:
         ValueError: If provider is not supported
     """
     providers = {
-        "openai": OpenAIProvider
+        "openai": OpenAIProvider,
+        "router": RoutingProvider,
     }
     
     provider_name = config.provider.lower()
@@ -0,0 +1,97 @@
+"""
+Parser for structured (JSON) LLM review responses.
+
+Expected shape:
+    {"findings": [{"rule_id": str, "line": int, "column": int, "message": str}]}
+
+A bare list of findings is accepted as well. Validation is done by hand so
+no schema library is needed at runtime.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a response is not a valid findings document"""
+
+
+@dataclass
+class Finding:
+    rule_id: str
+    line: int
+    column: int
+    message: str
+    file: Optional[str] = None
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a surrounding ```json ... ``` fence some models add anyway"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _validate_finding(item) -> Optional[Finding]:
+    if not isinstance(item, dict):
+        return None
+
+    rule_id = item.get("rule_id")
+    line = item.get("line")
+    column = item.get("column", 0)
+    message = item.get("message")
+    file = item.get("file")
+
+    # bool is a subclass of int, so reject it explicitly
+    if not isinstance(rule_id, str) or not rule_id.strip():
+        return None
+    if not isinstance(line, int) or isinstance(line, bool) or line < 1:
+        return None
+    if not isinstance(column, int) or isinstance(column, bool) or column < 0:
+        return None
+    if not isinstance(message, str) or not message.strip():
+        return None
+    if file is not None and not isinstance(file, str):
+        return None
+
+    return Finding(rule_id.strip(), line, column, message.strip(), file)
+
+
+def parse_findings(response: str) -> list[Finding]:
+    """
+    Parse and validate a structured findings response.
+
+    Individual malformed findings are dropped; a response that is not a
+    findings document at all raises so the caller can fall back.
+
+    Args:
+        response: Raw LLM response text
+
+    Returns:
+        List of validated Finding objects
+
+    Raises:
+        StructuredOutputError: If the response is not valid JSON or does
+            not contain a findings list
+    """
+    try:
+        data = json.loads(_strip_code_fence(response))
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Response is not valid JSON: {e}") from e
+
+    if isinstance(data, dict):
+        data = data.get("findings")
+
+    if not isinstance(data, list):
+        raise StructuredOutputError("Response does not contain a 'findings' list")
+
+    findings = []
+    for item in data:
+        finding = _validate_finding(item)
+        if finding:
+            findings.append(finding)
+    return findings
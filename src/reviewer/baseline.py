@@ -0,0 +1,86 @@
+"""
+Baseline of pre-existing findings.
+
+A finding's fingerprint is a hash of its rule ID and the whitespace-
+normalized content of the line it points at, so it survives lines moving
+up or down. Baselines are multisets (fingerprint -> count): if a line is
+duplicated and the copy repeats the violation, the copy is still new.
+
+A baseline can be computed from the base revision of each file, or
+saved to and loaded from a JSON file.
+"""
+
+import hashlib
+import json
+from collections import Counter
+
+from src.reviewer.models import StyleComment
+
+BASELINE_VERSION = 1
+
+
+def normalize_line(text: str) -> str:
+    return " ".join(text.split())
+
+
+def fingerprint(rule_id: str, line_text: str) -> str:
+    key = f"{rule_id}\0{normalize_line(line_text)}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+def _line_text(lines: list[str], line_number: int) -> str:
+    return lines[line_number - 1] if 0 < line_number <= len(lines) else ""
+
+
+class BaselineMatcher:
+    """Consumes baseline entries for one file while its findings are filtered"""
+
+    def __init__(self, counts: Counter, code: str):
+        self._remaining = Counter(counts)
+        self._lines = code.splitlines()
+
+    def filter_new(self, comments: list[StyleComment]) -> list[StyleComment]:
+        new = []
+        for c in comments:
+            fp = fingerprint(c.rule_id, _line_text(self._lines, c.line_number))
+            if self._remaining[fp] > 0:
+                self._remaining[fp] -= 1
+            else:
+                new.append(c)
+        return new
+
+
+class Baseline:
+    def __init__(self, files: dict = None):
+        self.files = {path: Counter(counts) for path, counts in (files or {}).items()}
+
+    def add(self, file_path: str, code: str, comments: list[StyleComment]):
+        """Record comments found in code as pre-existing for file_path"""
+        lines = code.splitlines()
+        counts = self.files.setdefault(file_path, Counter())
+        for c in comments:
+            counts[fingerprint(c.rule_id, _line_text(lines, c.line_number))] += 1
+
+    def matcher(self, file_path: str, code: str) -> BaselineMatcher:
+        return BaselineMatcher(self.files.get(file_path, Counter()), code)
+
+    @classmethod
+    def load(cls, path: str) -> "Baseline":
+        """
+        Raises:
+            ValueError: If the file is not a baseline of a supported version
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        if data.get("version") != BASELINE_VERSION:
+            raise ValueError(f"Unsupported baseline version in {path}: {data.get('version')}")
+        return cls(data.get("files", {}))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(
+                {"version": BASELINE_VERSION, "files": {p: dict(c) for p, c in sorted(self.files.items())}},
+                f,
+                indent=1,
+            )
@@ -0,0 +1,134 @@
+"""
+Run-level budget for a whole review.
+
+Caps total LLM tokens, LLM requests and wall time across every file in a
+PR. Files are reviewed highest-priority first so that when the budget runs
+out, the files left without LLM review are the least interesting ones.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Rough chars-per-token ratio for code; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class ReviewBudget:
+    """Limits for one review run. None means unlimited."""
+    max_tokens: Optional[int] = None
+    max_requests: Optional[int] = None
+    max_wall_time: Optional[float] = None
+
+    @property
+    def is_limited(self) -> bool:
+        return any(v is not None for v in (self.max_tokens, self.max_requests, self.max_wall_time))
+
+
+def _optional_number(name: str, cast):
+    value = os.getenv(name, "").strip()
+    return cast(value) if value else None
+
+
+def load_budget_from_env() -> ReviewBudget:
+    """
+    Build a budget from environment variables.
+
+    Environment variables:
+    - MAX_LLM_TOKENS: Estimated prompt + completion tokens for the run
+    - MAX_LLM_REQUESTS: Number of LLM calls for the run
+    - MAX_REVIEW_SECONDS: Wall time for the run
+    """
+    return ReviewBudget(
+        max_tokens=_optional_number("MAX_LLM_TOKENS", int),
+        max_requests=_optional_number("MAX_LLM_REQUESTS", int),
+        max_wall_time=_optional_number("MAX_REVIEW_SECONDS", float),
+    )
+
+
+def estimate_tokens(prompt: str, code: str, max_output_tokens: int) -> int:
+    """
+    Upper-bound token estimate for one review call.
+
+    Counts the prompt, the line-numbered code sent to the model and the
+    full completion allowance, since max_tokens is what we may be billed for.
+    """
+    line_count = code.count("\n") + 1
+    # Each line gets an "N: " prefix in the request
+    numbered_chars = len(code) + line_count * (len(str(line_count)) + 2)
+    return (len(prompt) + numbered_chars) // CHARS_PER_TOKEN + max_output_tokens
+
+
+@dataclass
+class FilePriority:
+    path: str
+    changed_lines: int
+    line_count: int
+    static_findings: int
+    weight: float = 1.0
+
+    @property
+    def score(self) -> float:
+        """Change size weighted by static-finding density and triage weight"""
+        density = self.static_findings / max(self.line_count, 1)
+        return self.changed_lines * (1.0 + density) * self.weight
+
+
+def prioritize(files: list[FilePriority]) -> list[FilePriority]:
+    """Sort by descending score; path breaks ties so the order is stable"""
+    return sorted(files, key=lambda f: (-f.score, f.path))
+
+
+@dataclass
+class BudgetGovernor:
+    budget: ReviewBudget
+    clock: Callable[[], float] = time.monotonic
+    tokens_used: int = 0
+    requests_used: int = 0
+    skipped: list[tuple[str, str]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.started_at = self.clock()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started_at
+
+    def time_exhausted(self) -> bool:
+        return self.budget.max_wall_time is not None and self.elapsed() >= self.budget.max_wall_time
+
+    def acquire_llm(self, path: str, estimated_tokens: int) -> bool:
+        """
+        Reserve budget for one LLM call.
+
+        Args:
+            path: File the call is for (used in the skip report)
+            estimated_tokens: Result of estimate_tokens for the call
+
+        Returns:
+            True if the call fits in the remaining budget
+        """
+        if self.budget.max_requests is not None and self.requests_used >= self.budget.max_requests:
+            self.skip(path, "LLM request budget exhausted")
+            return False
+
+        if self.budget.max_tokens is not None and self.tokens_used + estimated_tokens > self.budget.max_tokens:
+            self.skip(path, f"LLM token budget exhausted (needs ~{estimated_tokens} tokens)")
+            return False
+
+        self.requests_used += 1
+        self.tokens_used += estimated_tokens
+        return True
+
+    def skip(self, path: str, reason: str):
+        self.skipped.append((path, reason))
+
+    def report(self) -> str:
+        lines = [
+            f"Budget: {self.requests_used} LLM request(s), ~{self.tokens_used} token(s), "
+            f"{self.elapsed():.1f}s elapsed"
+        ]
+        for path, reason in self.skipped:
+            lines.append(f"  skipped {path}: {reason}")
+        return "\n".join(lines)
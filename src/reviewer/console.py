@@ -0,0 +1,20 @@
+"""
+Plain-text output of review comments for terminals and editors.
+
+Kept free of heavy imports: the pre-commit entry point loads it on every
+commit.
+"""
+
+from typing import Iterable
+
+from src.reviewer.models import StyleComment
+
+
+def print_comments(comments: Iterable[StyleComment]):
+    """Print findings as path:line:column: severity [rule] message"""
+    for c in comments:
+        if c.rule_id == "NO_ISSUES":
+            print(f"{c.file_path}: no violations found")
+            continue
+        lines = f"{c.line_number}-{c.end_line}" if c.end_line and c.end_line > c.line_number else c.line_number
+        print(f"{c.file_path}:{lines}:{c.position}: {c.severity.value} [{c.rule_id}] {c.message}")
@@ -0,0 +1,93 @@
+"""
+Deduplication and aggregation of review comments.
+
+Two reductions are applied:
+1. Comments on the same line whose rules share a family (e.g. the static
+   boolean naming rule and the LLM boolean semantics rule) are merged into
+   one comment, keeping the most severe rule and folding in other messages.
+2. Runs of the same rule and message on contiguous lines are collapsed
+   into a single ranged comment (line_number .. end_line).
+"""
+
+from dataclasses import replace
+
+from src.reviewer.models import Severity, Source, StyleComment
+from src.rules.rule_definitions import Rule
+
+SEVERITY_RANK = {
+    Severity.INFO: 0,
+    Severity.MINOR: 1,
+    Severity.MAJOR: 2,
+}
+
+
+def build_families(rules: list[Rule]) -> dict[str, str]:
+    """Map rule ID to family; rules without a family are their own family"""
+    return {r.id: r.family or r.id for r in rules}
+
+
+def _primary_first(comment: StyleComment):
+    # Most severe first, static before LLM, then earliest column
+    return (-SEVERITY_RANK[comment.severity], comment.source != Source.STATIC, comment.position)
+
+
+def _merge_same_line(comments: list[StyleComment], families: dict[str, str]) -> list[StyleComment]:
+    groups = {}
+    for c in comments:
+        key = (c.file_path, c.line_number, families.get(c.rule_id, c.rule_id))
+        groups.setdefault(key, []).append(c)
+
+    merged = []
+    for group in groups.values():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+
+        group.sort(key=_primary_first)
+        primary = group[0]
+        messages = [primary.message]
+        for c in group[1:]:
+            if c.message not in messages:
+                messages.append(c.message)
+
+        merged.append(replace(primary, message=" Also: ".join(messages)))
+    return merged
+
+
+def _collapse_runs(comments: list[StyleComment]) -> list[StyleComment]:
+    runs = {}
+    for c in comments:
+        key = (c.file_path, c.rule_id, c.message, c.source)
+        runs.setdefault(key, []).append(c)
+
+    collapsed = []
+    for group in runs.values():
+        group.sort(key=lambda c: c.line_number)
+        current = group[0]
+        for c in group[1:]:
+            end = current.end_line or current.line_number
+            if c.line_number <= end + 1:
+                if SEVERITY_RANK[c.severity] > SEVERITY_RANK[current.severity]:
+                    current = replace(current, severity=c.severity)
+                current = replace(current, end_line=max(end, c.end_line or c.line_number))
+            else:
+                collapsed.append(current)
+                current = c
+        collapsed.append(current)
+    return collapsed
+
+
+def aggregate_comments(comments: list[StyleComment], families: dict[str, str]) -> list[StyleComment]:
+    """
+    Merge same-line comments by rule family and collapse contiguous runs.
+
+    Args:
+        comments: Static and LLM comments for one or more files
+        families: Rule ID to family mapping from build_families
+
+    Returns:
+        Aggregated comments ordered by file and line
+    """
+    result = _collapse_runs(_merge_same_line(comments, families))
+    result.sort(key=lambda c: (c.file_path, c.line_number, c.position, c.rule_id))
+    return result
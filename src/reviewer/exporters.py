@@ -0,0 +1,223 @@
+"""
+Streaming exporters for review comments.
+
+Writers serialize StyleComment objects one at a time through a buffered
+file, so a full SARIF or JSON Lines document is never built in memory.
+Shards written by parallel workers (JSON Lines or SARIF) can be merged
+into any writer.
+
+Supported formats:
+- jsonl: one comment record per line
+- sarif: SARIF 2.1.0 with a single run
+"""
+
+import json
+from typing import Iterable, Iterator, Optional
+from urllib.parse import quote, unquote
+
+from src.reviewer.models import Severity, Source, StyleComment
+from src.rules.rule_definitions import Rule
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+TOOL_NAME = "llm-code-style-reviewer"
+TOOL_URI = "https://github.com/varuuuun/llm-code-style-reviewer"
+BUFFER_SIZE = 64 * 1024
+
+SARIF_LEVELS = {
+    Severity.INFO: "note",
+    Severity.MINOR: "warning",
+    Severity.MAJOR: "error",
+}
+
+
+def comment_to_record(comment: StyleComment) -> dict:
+    return {
+        "file_path": comment.file_path,
+        "line_number": comment.line_number,
+        "end_line": comment.end_line,
+        "position": comment.position,
+        "rule_id": comment.rule_id,
+        "message": comment.message,
+        "severity": comment.severity.value,
+        "source": comment.source.value,
+    }
+
+
+def record_to_comment(record: dict) -> StyleComment:
+    return StyleComment(
+        file_path=record["file_path"],
+        line_number=record["line_number"],
+        position=record.get("position", 0),
+        rule_id=record["rule_id"],
+        message=record["message"],
+        severity=Severity(record["severity"]),
+        source=Source(record.get("source", Source.STATIC.value)),
+        end_line=record.get("end_line"),
+    )
+
+
+def comment_to_sarif_result(comment: StyleComment) -> dict:
+    region = {
+        "startLine": max(comment.line_number, 1),
+        "startColumn": max(comment.position, 1),
+    }
+    if comment.end_line and comment.end_line > comment.line_number:
+        region["endLine"] = comment.end_line
+
+    return {
+        "ruleId": comment.rule_id,
+        "level": SARIF_LEVELS[comment.severity],
+        "message": {"text": comment.message},
+        "locations": [{
+            "physicalLocation": {
+                # A relative URI reference, so spaces and "%" in paths are escaped
+                "artifactLocation": {"uri": quote(comment.file_path)},
+                "region": region,
+            }
+        }],
+        "properties": {"source": comment.source.value},
+    }
+
+
+def sarif_result_to_comment(result: dict) -> StyleComment:
+    location = result["locations"][0]["physicalLocation"]
+    region = location.get("region", {})
+    levels = {level: severity for severity, level in SARIF_LEVELS.items()}
+
+    return StyleComment(
+        file_path=unquote(location["artifactLocation"]["uri"]),
+        line_number=region.get("startLine", 1),
+        position=region.get("startColumn", 0),
+        rule_id=result["ruleId"],
+        message=result["message"]["text"],
+        severity=levels.get(result.get("level"), Severity.INFO),
+        source=Source(result.get("properties", {}).get("source", Source.STATIC.value)),
+        end_line=region.get("endLine"),
+    )
+
+
+class JsonLinesWriter:
+    def __init__(self, path: str, append: bool = False, buffer_size: int = BUFFER_SIZE):
+        self._file = open(path, "a" if append else "w", buffering=buffer_size)
+        self.count = 0
+
+    def write(self, comment: StyleComment):
+        self._file.write(json.dumps(comment_to_record(comment)) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SarifWriter:
+    """
+    Writes results as they arrive; the tool section (with the rules
+    actually seen) is emitted after the results when the writer closes.
+    """
+
+    def __init__(self, path: str, rules: Optional[list[Rule]] = None, buffer_size: int = BUFFER_SIZE):
+        self._file = open(path, "w", buffering=buffer_size)
+        self._rules = {r.id: r for r in rules or []}
+        self._seen_rules = {}
+        self.count = 0
+        self._file.write(
+            f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "{SARIF_VERSION}", "runs": [{{"results": ['
+        )
+
+    def write(self, comment: StyleComment):
+        if self.count:
+            self._file.write(",")
+        self._file.write("\n" + json.dumps(comment_to_sarif_result(comment)))
+        self._seen_rules.setdefault(comment.rule_id, comment.severity)
+        self.count += 1
+
+    def _rule_descriptor(self, rule_id: str, severity: Severity) -> dict:
+        descriptor = {"id": rule_id, "defaultConfiguration": {"level": SARIF_LEVELS[severity]}}
+        rule = self._rules.get(rule_id)
+        if rule:
+            descriptor["shortDescription"] = {"text": rule.description}
+            descriptor["fullDescription"] = {"text": rule.message}
+            descriptor["defaultConfiguration"]["level"] = SARIF_LEVELS[rule.severity]
+        return descriptor
+
+    def close(self):
+        driver = {
+            "name": TOOL_NAME,
+            "informationUri": TOOL_URI,
+            "rules": [self._rule_descriptor(rid, sev) for rid, sev in sorted(self._seen_rules.items())],
+        }
+        self._file.write(f'\n], "tool": {{"driver": {json.dumps(driver)}}}}}]}}\n')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "sarif": SarifWriter,
+}
+
+
+def open_writer(output_format: str, path: str, rules: Optional[list[Rule]] = None):
+    """
+    Args:
+        output_format: One of WRITERS
+        path: Output file
+        rules: Rule definitions used to describe rules in SARIF output
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if output_format not in WRITERS:
+        raise ValueError(f"Unsupported output format: {output_format}. Supported formats: {list(WRITERS.keys())}")
+    if output_format == "sarif":
+        return SarifWriter(path, rules)
+    return JsonLinesWriter(path)
+
+
+def read_jsonl(path: str) -> Iterator[StyleComment]:
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield record_to_comment(json.loads(line))
+
+
+def read_sarif(path: str) -> Iterator[StyleComment]:
+    # SARIF has no streaming structure to exploit; shards are loaded one at a time
+    with open(path, "r") as f:
+        document = json.load(f)
+    for run in document.get("runs", []):
+        for result in run.get("results", []):
+            yield sarif_result_to_comment(result)
+
+
+def read_shard(path: str) -> Iterator[StyleComment]:
+    if path.endswith((".sarif", ".sarif.json")):
+        return read_sarif(path)
+    return read_jsonl(path)
+
+
+def merge_shards(paths: Iterable[str], writer) -> int:
+    """
+    Stream every comment from each shard into writer.
+
+    Returns:
+        Number of comments written
+    """
+    count = 0
+    for path in paths:
+        for comment in read_shard(path):
+            writer.write(comment)
+            count += 1
+    return count
@@ -0,0 +1,367 @@
+"""
+Git object-level source access.
+
+Reads file contents straight from the object database instead of the
+working tree, so both base and head versions are available and deleted or
+renamed files are handled. All blobs go through one long-lived
+`git cat-file --batch` process rather than a process per file.
+"""
+
+import re
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+READ_CHUNK = 64 * 1024
+# Paths per git ls-tree call, to stay under command line length limits
+LS_TREE_CHUNK = 1000
+# "@@ -a,b +c,d @@": new side starts at c and spans d lines (d defaults to 1)
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+@dataclass
+class ChangedFile:
+    path: str
+    status: str
+    old_path: Optional[str] = None
+
+    @property
+    def base_path(self) -> str:
+        """Path of the file on the base side (differs for renames and copies)"""
+        return self.old_path or self.path
+
+
+def list_changed_files(base: str, head: str = "HEAD", cwd: Optional[str] = None) -> list[ChangedFile]:
+    """
+    List files changed between the merge base of base and head, and head.
+
+    Args:
+        base: Base revision, e.g. origin/main
+        head: Head revision
+        cwd: Repository directory (defaults to the current directory)
+
+    Returns:
+        ChangedFile entries; status is git's letter (A, M, D, R, C, T)
+    """
+    result = subprocess.run(
+        ["git", "diff", "--name-status", "-z", "-M", f"{base}...{head}"],
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    )
+
+    fields = result.stdout.decode("utf-8", errors="replace").split("\0")
+    changed = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in ("R", "C"):
+            changed.append(ChangedFile(path=fields[i + 2], status=status, old_path=fields[i + 1]))
+            i += 3
+        else:
+            changed.append(ChangedFile(path=fields[i + 1], status=status))
+            i += 2
+    return changed
+
+
+def merge_base(base: str, head: str = "HEAD", cwd: Optional[str] = None) -> str:
+    """
+    Commit the changes in base...head are relative to.
+
+    Base versions of changed files should be read here rather than at the
+    tip of base, which may have moved on since head branched off.
+
+    Returns:
+        Full commit ID of the merge base
+    """
+    result = subprocess.run(
+        ["git", "merge-base", base, head],
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    )
+    return result.stdout.decode("utf-8").strip()
+
+
+def change_sizes(base: str, head: str = "HEAD", cwd: Optional[str] = None) -> dict[str, int]:
+    """
+    Added + deleted line counts per head path, from git diff --numstat.
+
+    Returns:
+        Path -> changed line count; binary files are left out
+    """
+    result = subprocess.run(
+        ["git", "diff", "--numstat", "-z", "-M", f"{base}...{head}"],
+        capture_output=True,
+        check=False,
+        cwd=cwd,
+    )
+
+    sizes = {}
+    fields = result.stdout.decode("utf-8", errors="replace").split("\0")
+    i = 0
+    while i < len(fields) and fields[i]:
+        added, deleted, path = fields[i].split("\t", 2)
+        i += 1
+        if not path:
+            # Renames: "added<TAB>deleted<TAB>" followed by old and new paths
+            path = fields[i + 1]
+            i += 2
+        # Binary files report "-" for both counts
+        if added.isdigit() and deleted.isdigit():
+            sizes[path] = int(added) + int(deleted)
+    return sizes
+
+
+def parse_hunk_ranges(diff: str) -> dict[str, list[tuple[int, int]]]:
+    """
+    New-side line ranges of every hunk in unified diff output.
+
+    The "+++ " file header is only recognized between "diff --git" and the
+    first hunk of a file, so added lines that start with "++ " are not
+    mistaken for headers. Expects --no-prefix paths.
+
+    Returns:
+        Path -> inclusive (first, last) line ranges; deleted files are left
+        out and hunks with no new-side lines add no range
+    """
+    ranges = {}
+    path = None
+    in_header = False
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            path, in_header = None, True
+        elif in_header and line.startswith("+++ "):
+            # Paths with spaces get a trailing tab in diff headers
+            name = line[4:].rstrip("\t")
+            path = None if name == "/dev/null" else name
+            if path:
+                ranges.setdefault(path, [])
+        elif line.startswith("@@"):
+            in_header = False
+            match = HUNK_HEADER.match(line)
+            if path and match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                if count:
+                    ranges[path].append((start, start + count - 1))
+    return ranges
+
+
+def diff_line_ranges(base: str, head: str = "HEAD", context: int = 3,
+                     cwd: Optional[str] = None) -> dict[str, list[tuple[int, int]]]:
+    """
+    New-side hunk ranges of base...head, context lines included.
+
+    With context=3 these are the lines GitHub shows in a pull request diff,
+    and so the only lines a review comment can be attached to.
+    """
+    result = subprocess.run(
+        ["git", "-c", "core.quotePath=false", "diff", f"--unified={context}", "--no-color",
+         "--no-ext-diff", "--no-prefix", "-M", f"{base}...{head}"],
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    )
+    return parse_hunk_ranges(result.stdout.decode("utf-8", errors="replace"))
+
+
+def clamp_to_hunk(start: int, end: int, ranges: list[tuple[int, int]]) -> tuple[int, int]:
+    """
+    Narrow an inclusive line range to one hunk.
+
+    The hunk containing end is preferred, then the one containing start.
+    If neither end is in a hunk, the range shrinks to its first line.
+
+    Returns:
+        (start, end) within a single hunk; start == end for a single line
+    """
+    for first, last in ranges:
+        if first <= end <= last:
+            return max(start, first), end
+    for first, last in ranges:
+        if first <= start <= last:
+            return start, min(end, last)
+    return start, start
+
+
+def staged_line_ranges(cwd: Optional[str] = None) -> dict[str, list[tuple[int, int]]]:
+    """
+    Lines added or changed in the index relative to HEAD.
+
+    Returns:
+        Path -> inclusive (first, last) line ranges in the staged version;
+        deleted files are left out and pure deletions add no range
+    """
+    result = subprocess.run(
+        ["git", "-c", "core.quotePath=false", "diff", "--cached", "--unified=0", "--no-color",
+         "--no-ext-diff", "--no-prefix", "--diff-filter=ACMR", "-M"],
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    )
+    return parse_hunk_ranges(result.stdout.decode("utf-8", errors="replace"))
+
+
+def blob_sizes(rev: str, paths: Iterable[str], cwd: Optional[str] = None) -> dict[str, int]:
+    """
+    Sizes in bytes of files at a revision, without reading their contents.
+
+    Returns:
+        Path -> size; paths that do not exist at rev are left out
+    """
+    paths = list(paths)
+    result = subprocess.run(
+        ["git", "cat-file", "--batch-check"],
+        input="".join(f"{rev}:{path}\n" for path in paths).encode("utf-8"),
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    )
+
+    sizes = {}
+    # One output line per input line: "<oid> <type> <size>" or "<name> missing"
+    for path, line in zip(paths, result.stdout.decode("utf-8", errors="replace").splitlines()):
+        parts = line.split()
+        if len(parts) == 3 and parts[2].isdigit():
+            sizes[path] = int(parts[2])
+    return sizes
+
+
+def prefetch_blobs(rev: str, paths: Iterable[str], remote: str = "origin", cwd: Optional[str] = None) -> int:
+    """
+    Fetch the blobs of paths at rev in one request, in a partial clone.
+
+    When remote was fetched with --filter=blob:none, git fetches every
+    missing blob that cat-file reads on demand, one round trip per object.
+    Prefetching the blobs GitBlobReader is about to read avoids that. Does
+    nothing if remote is not a partial clone remote.
+
+    Returns:
+        Number of blobs requested
+    """
+    promisor = subprocess.run(
+        ["git", "config", "--get", "--bool", f"remote.{remote}.promisor"],
+        capture_output=True,
+        check=False,
+        cwd=cwd,
+    )
+    if promisor.stdout.strip() != b"true":
+        return 0
+
+    # Trees are present in a blob-filtered clone, so listing them fetches nothing
+    paths = list(paths)
+    oids = []
+    for i in range(0, len(paths), LS_TREE_CHUNK):
+        result = subprocess.run(
+            ["git", "--literal-pathspecs", "ls-tree", "-z", rev, "--", *paths[i:i + LS_TREE_CHUNK]],
+            capture_output=True,
+            check=True,
+            cwd=cwd,
+        )
+        for entry in result.stdout.decode("utf-8", errors="replace").split("\0"):
+            # "<mode> <type> <oid>\t<path>"
+            info = entry.split("\t", 1)[0].split()
+            if len(info) == 3 and info[1] == "blob":
+                oids.append(info[2])
+
+    if oids:
+        # Same request git makes for a single lazily fetched object
+        subprocess.run(
+            ["git", "-c", "fetch.negotiationAlgorithm=noop", "fetch", "--no-tags", "--no-write-fetch-head",
+             "--recurse-submodules=no", "--filter=blob:none", "--stdin", remote],
+            input="".join(f"{oid}\n" for oid in oids).encode("utf-8"),
+            capture_output=True,
+            check=True,
+            cwd=cwd,
+        )
+    return len(oids)
+
+
+class GitBlobReader:
+    def __init__(self, cwd: Optional[str] = None):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=cwd,
+        )
+
+    def _request(self, rev: str, path: str):
+        self._process.stdin.write(f"{rev}:{path}\n".encode("utf-8"))
+
+    def _read_response(self, max_bytes: Optional[int]) -> Optional[str]:
+        stdout = self._process.stdout
+        header = stdout.readline().decode("utf-8", errors="replace").rstrip("\n")
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+
+        parts = header.split()
+        # "<name> missing" / "<name> ambiguous" for objects that do not exist
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+
+        object_type, remaining = parts[1], int(parts[2])
+        chunks = []
+        kept = 0
+        while remaining:
+            chunk = stdout.read(min(remaining, READ_CHUNK))
+            if not chunk:
+                raise RuntimeError("git cat-file output ended mid-object")
+            remaining -= len(chunk)
+            if max_bytes is None or kept < max_bytes:
+                chunk = chunk if max_bytes is None else chunk[:max_bytes - kept]
+                chunks.append(chunk)
+                kept += len(chunk)
+        stdout.read(1)  # trailing newline after the object contents
+
+        if object_type != "blob":
+            return None
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    def read(self, rev: str, path: str, max_bytes: Optional[int] = None) -> Optional[str]:
+        """
+        Read one file at a revision.
+
+        Args:
+            rev: Revision, e.g. HEAD or origin/main
+            path: Repository-relative path
+            max_bytes: Keep at most this many bytes of the blob
+
+        Returns:
+            File contents, or None if the path does not exist at rev
+        """
+        self._request(rev, path)
+        self._process.stdin.flush()
+        return self._read_response(max_bytes)
+
+    def read_many(self, items: Iterable[tuple[str, str]], max_bytes: Optional[int] = None) -> list[Optional[str]]:
+        """
+        Read many (rev, path) pairs in one pipelined batch.
+
+        Requests are written from a background thread so a large batch
+        cannot deadlock on full pipe buffers.
+        """
+        items = list(items)
+
+        def write_requests():
+            for rev, path in items:
+                self._request(rev, path)
+            self._process.stdin.flush()
+
+        writer = threading.Thread(target=write_requests)
+        writer.start()
+        results = [self._read_response(max_bytes) for _ in items]
+        writer.join()
+        return results
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 
 class Severity(str, Enum):
@@ -22,3 +23,4 @@ class StyleComment:
     message: str
     severity: Severity
     source: Source = Source.STATIC
+    end_line: Optional[int] = None
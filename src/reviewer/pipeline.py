@@ -1,15 +1,142 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+from src.analysis.guard import cap_findings
+from src.analysis.registry import CheckerRegistry
+from src.reviewer.baseline import Baseline, BaselineMatcher
+from src.reviewer.dedup import aggregate_comments, build_families
 from src.reviewer.models import Severity, StyleComment
-from src.rules.rule_loader import load_rules
+from src.rules.rule_loader import load_rules_cached
 from src.analysis.static_checks import CHECKERS
-from src.llm.llm_reviewer import LLMReviewer
-from src.llm.client import LLMClient
+
+ACTION_ROOT = os.getenv("ACTION_ROOT", "/action")
+STATIC_RULES_PATH = os.path.join(ACTION_ROOT, "data/coding_standard/rules.yaml")
+LLM_RULES_PATH = os.path.join(ACTION_ROOT, "src/rules/llm_rules.yaml")
+CONFIG_PATH = os.path.join(ACTION_ROOT, "config.yaml")
+# "python" or "numpy" (vectorized line checks, needs numpy installed)
+STATIC_BACKEND = os.getenv("STATIC_BACKEND", "python").strip().lower()
+# Extra rule files and checker plugin directories, separated by os.pathsep
+EXTRA_STATIC_RULES = [p for p in os.getenv("EXTRA_STATIC_RULES", "").split(os.pathsep) if p]
+CHECKER_PLUGIN_DIRS = [p for p in os.getenv("CHECKER_PLUGIN_DIRS", "").split(os.pathsep) if p]
+
+
+@lru_cache(maxsize=None)
+def get_checkers(backend: str = STATIC_BACKEND) -> dict:
+    """Checker table for the requested backend, falling back to pure Python"""
+    if backend != "numpy":
+        return CHECKERS
+
+    from src.analysis.vectorized import VECTORIZED_CHECKERS, numpy_available
+
+    if not numpy_available():
+        print("Warning: STATIC_BACKEND=numpy but numpy is not installed; using the Python checkers")
+        return CHECKERS
+    return {**CHECKERS, **VECTORIZED_CHECKERS}
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> CheckerRegistry:
+    return CheckerRegistry(get_checkers(), CHECKER_PLUGIN_DIRS)
+
+
+def load_static_rules() -> list:
+    """Built-in static rules plus EXTRA_STATIC_RULES (same ID overrides the built-in rule)"""
+    rules = {rule.id: rule for rule in load_rules_cached(STATIC_RULES_PATH)}
+    for path in EXTRA_STATIC_RULES:
+        rules.update((rule.id, rule) for rule in load_rules_cached(path))
+    return list(rules.values())
+
+
+# config path -> LLMClient, so provider state (routing, concurrency and
+# latency stats) is shared by every file reviewed in this process
+_llm_clients = {}
+
+
+def get_llm_client(config_path: str = CONFIG_PATH):
+    from src.llm.client import LLMClient
+
+    if config_path not in _llm_clients:
+        _llm_clients[config_path] = LLMClient(config_path=config_path)
+    return _llm_clients[config_path]
+
+
+def llm_usage_report() -> list[str]:
+    """Per-backend usage of the LLM clients created so far (routing provider only)"""
+    lines = []
+    for client in _llm_clients.values():
+        report = getattr(client.provider, "report", None)
+        if report:
+            lines.extend(report())
+    return lines
 
 
 def should_send_to_llm(code: str, max_lines: int = 300) -> bool:
     return len(code.splitlines()) <= max_lines
 
 
-def run_reviewer(file_path: str, code: str, enable_llm: bool = True, config_path: str = "/action/config.yaml"):
+def in_line_ranges(comment: StyleComment, ranges: list[tuple[int, int]], line_count: int) -> bool:
+    """Whether a comment's lines overlap a range (end-of-file findings count as the last line)"""
+    first = min(comment.line_number, line_count)
+    last = min(comment.end_line or comment.line_number, line_count)
+    return any(start <= last and first <= end for start, end in ranges)
+
+
+def check_static_rules(file_path: str, code: str, static_rules) -> dict[str, list[StyleComment]]:
+    """
+    Run every static checker once, without baseline filtering or caps.
+
+    Returns:
+        Rule ID -> findings; rules without a checker, or whose plugin
+        checker failed, are left out
+    """
+    findings = {}
+    registry = get_registry()
+    for rule in static_rules:
+        checker = registry.resolve(rule)
+        if checker:
+            try:
+                findings[rule.id] = checker(file_path, code, rule)
+            except Exception as e:
+                if not rule.checker:
+                    raise
+                # A broken plugin only loses its own rule
+                print(f"Warning: checker '{rule.checker}' failed on {file_path}: {e}")
+    return findings
+
+
+def run_static_checks(file_path: str, code: str, static_rules,
+                      max_findings_per_rule: Optional[int] = None,
+                      matcher: Optional[BaselineMatcher] = None,
+                      raw_findings: Optional[dict[str, list[StyleComment]]] = None) -> list[StyleComment]:
+    """
+    Static findings for a file, baseline-filtered and capped per rule.
+
+    Args:
+        raw_findings: Output of check_static_rules for this code, to reuse
+            an earlier pass instead of running the checkers again
+    """
+    if raw_findings is None:
+        raw_findings = check_static_rules(file_path, code, static_rules)
+
+    comments = []
+    for rule in static_rules:
+        found = raw_findings.get(rule.id)
+        if not found:
+            continue
+        # Drop pre-existing findings before capping so the cap counts new ones only
+        if matcher:
+            found = matcher.filter_new(found)
+        if max_findings_per_rule is not None:
+            found = cap_findings(found, max_findings_per_rule)
+        comments.extend(found)
+    return comments
+
+
+def run_reviewer(file_path: str, code: str, enable_llm: bool = True, config_path: str = CONFIG_PATH,
+                 max_findings_per_rule: Optional[int] = None, baseline: Optional[Baseline] = None,
+                 line_ranges: Optional[list[tuple[int, int]]] = None,
+                 static_findings: Optional[dict[str, list[StyleComment]]] = None):
     """
     Run the code reviewer (static checks + optional LLM review).
     
@@ -18,19 +145,31 @@ def run_reviewer(file_path: str, code: str, enable_llm: bool = True, config_path
         code: Code content to review
         enable_llm: Whether to enable LLM-based reviews
         config_path: Path to LLM config file
+        max_findings_per_rule: Cap on static findings per rule (None for no cap)
+        baseline: Pre-existing findings to suppress (only new findings are reported)
+        line_ranges: Only report findings on these inclusive line ranges; applied
+            before runs of findings are collapsed, so a collapsed comment
+            never spans lines outside them
+        static_findings: Raw static findings already computed for this code
+            (check_static_rules), so the checkers are not run twice
         
     Returns:
         List of StyleComment objects
     """
     comments = []
+    families = {}
+    matcher = baseline.matcher(file_path, code) if baseline else None
+
+    # Pick up edited plugin checkers in long-running processes
+    get_registry().refresh()
 
     # Try static rules if they exist
     try:
-        static_rules = load_rules("/action/data/coding_standard/rules.yaml")
-        for rule in static_rules:
-            checker = CHECKERS.get(rule.id)
-            if checker:
-                comments.extend(checker(file_path, code, rule))
+        static_rules = load_static_rules()
+        families.update(build_families(static_rules))
+        comments.extend(
+            run_static_checks(file_path, code, static_rules, max_findings_per_rule, matcher, static_findings)
+        )
     except (Exception) as e:
         # Static rules file doesn't exist or is misconfigured
         print(f"Warning: Static rule checks failed: {e}")
@@ -38,12 +177,16 @@ def run_reviewer(file_path: str, code: str, enable_llm: bool = True, config_path
     # LLM-based semantic review
     if enable_llm:
         try:
-            llm_rules = load_rules("/action/src/rules/llm_rules.yaml")
-            llm_client = LLMClient(config_path=config_path)
+            from src.llm.llm_reviewer import LLMReviewer
+
+            llm_rules = load_rules_cached(LLM_RULES_PATH)
+            families.update(build_families(llm_rules))
+            llm_client = get_llm_client(config_path)
             llm_reviewer = LLMReviewer(llm_client)
 
             if should_send_to_llm(code):
-                comments.extend(llm_reviewer.review(file_path, code, llm_rules))
+                llm_comments = llm_reviewer.review(file_path, code, llm_rules)
+                comments.extend(matcher.filter_new(llm_comments) if matcher else llm_comments)
         except Exception as e:
             print(f"Warning: LLM review failed: {e}")
 
@@ -75,6 +218,12 @@ def run_reviewer(file_path: str, code: str, enable_llm: bool = True, config_path
     for i in sorted(to_ignore, reverse=True):
         del comments[i]
 
+    if line_ranges is not None:
+        line_count = max(len(lines), 1)
+        comments = [c for c in comments if in_line_ranges(c, line_ranges, line_count)]
+
+    comments = aggregate_comments(comments, families)
+
     if len(comments) == 0:
         comments.append(
             StyleComment(
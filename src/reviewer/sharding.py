@@ -0,0 +1,113 @@
+"""
+Splitting one PR review across parallel CI jobs.
+
+Every shard computes the same partition of the changed files from the
+same inputs, so no coordination is needed: files are weighted by size
+and assigned greedily, largest first, to the least loaded shard (LPT).
+Ties are broken by path and shard index, which keeps the assignment
+deterministic. Each shard writes its findings to a JSON Lines file; the
+merge step combines the files, drops duplicates and posts one review.
+"""
+
+import glob
+from typing import Iterable, Optional
+
+from src.reviewer.exporters import read_shard
+from src.reviewer.models import StyleComment
+
+# Fixed cost per file (process setup, LLM round trip) expressed in bytes,
+# so many tiny files do not all land on one shard
+FILE_OVERHEAD_BYTES = 4_000
+
+
+class ShardFileError(ValueError):
+    """A shard file is missing, unreadable or not a shard"""
+
+
+def partition(weights: dict[str, int], shard_count: int) -> list[list[str]]:
+    """
+    Assign paths to shards, balancing the total weight.
+
+    Args:
+        weights: Path -> weight (e.g. file size in bytes)
+        shard_count: Number of shards
+
+    Returns:
+        One list of paths per shard, each sorted by path
+    """
+    if shard_count < 1:
+        raise ValueError(f"shard_count must be at least 1, got {shard_count}")
+
+    loads = [0] * shard_count
+    shards = [[] for _ in range(shard_count)]
+    for path in sorted(weights, key=lambda p: (-weights[p], p)):
+        target = min(range(shard_count), key=lambda i: (loads[i], i))
+        shards[target].append(path)
+        loads[target] += weights[path]
+    return [sorted(paths) for paths in shards]
+
+
+def file_weights(sizes: dict[str, int]) -> dict[str, int]:
+    """Partition weights from file sizes in bytes"""
+    return {path: size + FILE_OVERHEAD_BYTES for path, size in sizes.items()}
+
+
+def shard_output_path(template: str, index: int, count: int) -> str:
+    """Expand {index} and {count} in a shard file name"""
+    return template.format(index=index, count=count)
+
+
+def _comment_key(comment: StyleComment) -> tuple:
+    return (
+        comment.file_path,
+        comment.line_number,
+        comment.end_line,
+        comment.position,
+        comment.rule_id,
+        comment.message,
+    )
+
+
+def merge_shard_comments(paths: Iterable[str], expected_count: Optional[int] = None) -> list[StyleComment]:
+    """
+    Read shard files and combine their comments.
+
+    Duplicates (e.g. a file reviewed by two shards after a retry) are
+    dropped, and comments are grouped by file in path order while keeping
+    each file's own order.
+
+    Args:
+        paths: Shard files
+        expected_count: Number of shards the review was split into, if known
+
+    Raises:
+        ShardFileError: If a shard is missing or cannot be read; nothing
+            is merged, since a partial review would look complete
+    """
+    paths = list(paths)
+    if expected_count is not None and len(paths) != expected_count:
+        raise ShardFileError(f"Expected {expected_count} shard file(s), found {len(paths)}: {paths}")
+
+    seen = set()
+    comments = []
+    for path in paths:
+        try:
+            shard = list(read_shard(path))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ShardFileError(f"Cannot read shard file {path}: {e!r}") from e
+
+        for comment in shard:
+            key = _comment_key(comment)
+            if key not in seen:
+                seen.add(key)
+                comments.append(comment)
+
+    # A file that got findings from one shard needs no "no issues" entry
+    with_findings = {c.file_path for c in comments if c.rule_id != "NO_ISSUES"}
+    comments = [c for c in comments if c.rule_id != "NO_ISSUES" or c.file_path not in with_findings]
+    return sorted(comments, key=lambda c: c.file_path)
+
+
+def find_shards(pattern: str) -> list[str]:
+    """Shard files matching a glob pattern, in a stable order"""
+    return sorted(glob.glob(pattern, recursive=True))
@@ -0,0 +1,244 @@
+"""
+Cheap pre-LLM triage.
+
+Builds a structural fingerprint for each file (method count, accessor
+count, identifiers, a bottom-k sketch of token shingles) and decides
+whether the file is worth an LLM call:
+
+- skip: test fixtures, formatting-only changes, getter/setter-only
+  classes, and near-duplicates of a file already reviewed
+- deprioritize: files that introduce almost no new identifiers
+- review: everything else
+
+Decisions are printed and optionally appended to a JSON Lines audit log.
+"""
+
+import json
+import os
+import re
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z_$][\w$]*|\d[\w.]*|\S")
+METHOD_PATTERN = re.compile(r"(public|private|protected)\s+[\w<>\[\]]+\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+ACCESSOR_PATTERN = re.compile(r"^(get|set|is|has)[A-Z_]")
+# Accessor-sized body: a single "return field;" or "this.field = value;"
+ACCESSOR_BODY_PATTERN = re.compile(r"\s*(?:return\s+(?:this\.)?[\w$]+|(?:this\.)?[\w$]+\s*=\s*[\w$]+)\s*;\s*")
+FIXTURE_MARKERS = ("/fixtures/", "/fixture/", "/testdata/", "src/test/resources/")
+
+JAVA_KEYWORDS = frozenset("""
+abstract assert boolean break byte case catch char class const continue default do double else
+enum extends final finally float for goto if implements import instanceof int interface long
+native new package private protected public return short static strictfp super switch
+synchronized this throw throws transient try void volatile while true false null var record
+""".split())
+
+SHINGLE_SIZE = 5
+SKETCH_SIZE = 64
+
+
+@dataclass
+class Fingerprint:
+    method_count: int
+    accessor_count: int
+    identifiers: frozenset
+    sketch: tuple
+
+
+@dataclass
+class TriageDecision:
+    path: str
+    action: str
+    reason: str
+    method_count: int = 0
+    accessor_count: int = 0
+    novelty: float = 1.0
+    similarity: float = 0.0
+
+
+def tokenize(code: str) -> list[str]:
+    return TOKEN_PATTERN.findall(code)
+
+
+def _sketch(tokens: list[str]) -> tuple:
+    """Bottom-k MinHash sketch of token shingles (crc32 is stable across runs)"""
+    hashes = set()
+    for i in range(max(len(tokens) - SHINGLE_SIZE + 1, 1)):
+        shingle = " ".join(tokens[i:i + SHINGLE_SIZE])
+        hashes.add(zlib.crc32(shingle.encode("utf-8")))
+    return tuple(sorted(hashes)[:SKETCH_SIZE])
+
+
+def sketch_similarity(a: tuple, b: tuple) -> float:
+    """Estimated Jaccard similarity of two bottom-k sketches"""
+    if not a or not b:
+        return 0.0
+    union = sorted(set(a) | set(b))[:SKETCH_SIZE]
+    shared = set(a) & set(b)
+    return sum(1 for h in union if h in shared) / len(union)
+
+
+def _method_body(code: str, start: int) -> Optional[str]:
+    """Text between the braces of the method whose signature ends at start (None if it has no body)"""
+    brace, semicolon = code.find("{", start), code.find(";", start)
+    if brace == -1 or -1 < semicolon < brace:
+        return None
+
+    depth = 0
+    for i in range(brace, len(code)):
+        if code[i] == "{":
+            depth += 1
+        elif code[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return code[brace + 1:i]
+    return code[brace + 1:]
+
+
+def _is_accessor(code: str, match: re.Match) -> bool:
+    if not ACCESSOR_PATTERN.match(match.group(2)):
+        return False
+    body = _method_body(code, match.end())
+    return body is None or ACCESSOR_BODY_PATTERN.fullmatch(body) is not None
+
+
+def fingerprint(code: str, tokens: Optional[list[str]] = None) -> Fingerprint:
+    tokens = tokens if tokens is not None else tokenize(code)
+    methods = list(METHOD_PATTERN.finditer(code))
+
+    return Fingerprint(
+        method_count=len(methods),
+        accessor_count=sum(1 for m in methods if _is_accessor(code, m)),
+        identifiers=frozenset(
+            t for t in tokens if (t[0].isalpha() or t[0] in "_$") and t not in JAVA_KEYWORDS
+        ),
+        sketch=_sketch(tokens),
+    )
+
+
+class Triage:
+    def __init__(self, audit_path: Optional[str] = None, state_path: Optional[str] = None,
+                 duplicate_threshold: float = 0.9, novelty_threshold: float = 0.1):
+        """
+        Args:
+            audit_path: JSON Lines file every decision is appended to
+            state_path: JSON file persisting reviewed fingerprints across runs
+            duplicate_threshold: Similarity at or above which a file is skipped
+            novelty_threshold: New-identifier ratio below which a file is deprioritized
+        """
+        self.audit_path = audit_path
+        self.state_path = state_path
+        self.duplicate_threshold = duplicate_threshold
+        self.novelty_threshold = novelty_threshold
+        # Reviewed files: path -> sketch and path -> identifiers. Identifiers are
+        # kept per file so a file's own earlier version never counts against it.
+        self.reviewed = {}
+        self.identifiers = {}
+        self._identifier_counts = Counter()
+
+        if state_path and os.path.exists(state_path):
+            with open(state_path, "r") as f:
+                state = json.load(f)
+            self.reviewed.update({p: tuple(s) for p, s in state.get("sketches", {}).items()})
+            identifiers = state.get("identifiers", {})
+            if isinstance(identifiers, list):
+                # Older state files kept one shared list, attributed to no file
+                identifiers = {"": identifiers}
+            for p, names in identifiers.items():
+                self._record_identifiers(p, frozenset(names))
+
+    def _record_identifiers(self, path: str, names: frozenset):
+        self._forget_identifiers(path)
+        self.identifiers[path] = names
+        self._identifier_counts.update(names)
+
+    def _forget_identifiers(self, path: str):
+        self._identifier_counts.subtract(self.identifiers.pop(path, ()))
+
+    def _novelty(self, identifiers: frozenset, own_paths: set) -> float:
+        """Share of identifiers not seen in any other reviewed file"""
+        own = [self.identifiers[p] for p in own_paths if p in self.identifiers]
+        new = sum(
+            1 for name in identifiers
+            if self._identifier_counts[name] <= sum(1 for names in own if name in names)
+        )
+        return new / max(len(identifiers), 1)
+
+    def _most_similar(self, sketch: tuple, own_paths: set):
+        best_path, best = None, 0.0
+        for path, other in self.reviewed.items():
+            if path in own_paths:
+                continue
+            similarity = sketch_similarity(sketch, other)
+            if similarity > best:
+                best_path, best = path, similarity
+        return best_path, best
+
+    def _decide(self, path: str, code: str, base_code: Optional[str], base_path: Optional[str]) -> TriageDecision:
+        normalized_path = "/" + path.replace(os.sep, "/")
+        if any(marker in normalized_path for marker in FIXTURE_MARKERS) or path.endswith("Fixture.java"):
+            return TriageDecision(path, "skip", "test fixture")
+
+        tokens = tokenize(code)
+        if base_code is not None and tokenize(base_code) == tokens:
+            return TriageDecision(path, "skip", "formatting-only change")
+
+        fp = fingerprint(code, tokens)
+        # Earlier versions of this file (same path, or the old path of a rename)
+        own_paths = {path, base_path or path}
+        novelty = self._novelty(fp.identifiers, own_paths)
+        similar_path, similarity = self._most_similar(fp.sketch, own_paths)
+        decision = TriageDecision(
+            path, "review", "", fp.method_count, fp.accessor_count, round(novelty, 3), round(similarity, 3)
+        )
+
+        if fp.method_count and fp.accessor_count == fp.method_count:
+            decision.action, decision.reason = "skip", "getters and setters only"
+        elif similarity >= self.duplicate_threshold:
+            decision.action, decision.reason = "skip", f"near-duplicate of {similar_path}"
+        else:
+            for own_path in own_paths - {path}:
+                # The old path of a rename no longer exists
+                self.reviewed.pop(own_path, None)
+                self._forget_identifiers(own_path)
+            self._record_identifiers(path, fp.identifiers)
+            self.reviewed[path] = fp.sketch
+            if novelty < self.novelty_threshold:
+                decision.action, decision.reason = "deprioritize", "few new identifiers"
+        return decision
+
+    def assess(self, path: str, code: str, base_code: Optional[str] = None,
+               base_path: Optional[str] = None) -> TriageDecision:
+        """
+        Decide whether a file should be sent to the LLM.
+
+        Args:
+            path: File path (used for fixture detection and auditing)
+            code: Head version of the file
+            base_code: Base version, if the file existed before the change
+            base_path: Path on the base side, if the file was renamed
+
+        Returns:
+            TriageDecision with action "review", "deprioritize" or "skip"
+        """
+        decision = self._decide(path, code, base_code, base_path)
+        print(f"Triage: {path} -> {decision.action}" + (f" ({decision.reason})" if decision.reason else ""))
+
+        if self.audit_path:
+            with open(self.audit_path, "a") as f:
+                f.write(json.dumps(asdict(decision)) + "\n")
+        return decision
+
+    def save(self):
+        if not self.state_path:
+            return
+        with open(self.state_path, "w") as f:
+            json.dump(
+                {
+                    "identifiers": {p: sorted(names) for p, names in self.identifiers.items()},
+                    "sketches": {p: list(s) for p, s in self.reviewed.items()},
+                },
+                f,
+            )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 from src.reviewer.models import Severity
 
 
@@ -9,3 +10,6 @@ class Rule:
     applies_to: str
     severity: Severity
     message: str
+    family: Optional[str] = None
+    # Plugin checker reference ("module:function" or an entry point name)
+    checker: Optional[str] = None
@@ -1,11 +1,21 @@
+import os
+
 import yaml
 from src.rules.rule_definitions import Rule
 from src.reviewer.models import Severity
 
 
-def load_rules(path: str) -> list[Rule]:
+# libyaml's C loader is several times faster; fall back to pure Python
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(path: str):
     with open(path, "r") as f:
-        raw_rules = yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def load_rules(path: str) -> list[Rule]:
+    raw_rules = load_yaml(path)
 
     rules = []
     for r in raw_rules:
@@ -16,6 +26,30 @@ def load_rules(path: str) -> list[Rule]:
                 applies_to=r["applies_to"],
                 severity=Severity(r["severity"]),
                 message=r["message"],
+                family=r.get("family"),
+                checker=r.get("checker"),
             )
         )
     return rules
+
+
+# path -> ((mtime_ns, size), rules)
+_rules_cache = {}
+
+
+def load_rules_cached(path: str) -> list[Rule]:
+    """
+    load_rules, re-reading the file only when it changed on disk.
+
+    Long-running processes call this for every file, so edits to a rule
+    file take effect without a restart.
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _rules_cache.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    rules = load_rules(path)
+    _rules_cache[path] = (version, rules)
+    return rules
@@ -0,0 +1,4 @@
+import os
+
+# Rules and config are read from the checkout, not the /action image path
+os.environ.setdefault("ACTION_ROOT", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
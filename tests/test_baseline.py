@@ -0,0 +1,101 @@
+"""
+Tests for baseline fingerprints: only findings that were not already
+present in the baseline are reported.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scripts.run_action import add_base_findings
+from src.reviewer.baseline import Baseline
+from src.reviewer.git_source import ChangedFile, GitBlobReader, merge_base
+from src.reviewer.pipeline import load_static_rules, run_reviewer, run_static_checks
+from tests.test_git_source import git, write
+
+BASE = "public class A {\n    int a=1;\n    void run() {}\n}\n"
+
+
+def baseline_of(code: str, path: str = "A.java") -> Baseline:
+    baseline = Baseline()
+    baseline.add(path, code, run_static_checks(path, code, load_static_rules()))
+    return baseline
+
+
+def new_findings(baseline: Baseline, code: str) -> list[tuple[str, int]]:
+    comments = run_reviewer("A.java", code, enable_llm=False, baseline=baseline)
+    return [(c.rule_id, c.line_number) for c in comments if c.rule_id != "NO_ISSUES"]
+
+
+class BaselineMatcherTest(unittest.TestCase):
+    def test_unchanged_file_has_no_new_findings(self):
+        self.assertNotEqual(new_findings(None, BASE), [])
+        self.assertEqual(new_findings(baseline_of(BASE), BASE), [])
+
+    def test_duplicated_line_reports_only_the_copy(self):
+        head = "public class A {\n    int a=1;\n    int a=1;\n    void run() {}\n}\n"
+
+        found = new_findings(baseline_of(BASE), head)
+
+        self.assertNotEqual(found, [])
+        # One occurrence is consumed by the baseline, the extra one is new
+        self.assertEqual({line for _, line in found}, {3})
+        self.assertEqual(sorted(rule for rule, _ in found), sorted(rule for rule, _ in new_findings(None, BASE)))
+
+    def test_whitespace_only_change_is_not_new(self):
+        head = "public class A {\n    int   a=1;\n    void run()  {}\n}\n"
+
+        self.assertEqual(new_findings(baseline_of(BASE), head), [])
+
+    def test_moved_line_is_not_new(self):
+        head = "public class A {\n    void run() {}\n\n\n    int a=1;\n}\n"
+
+        self.assertEqual(new_findings(baseline_of(BASE), head), [])
+
+    def test_other_file_is_not_matched(self):
+        self.assertEqual(new_findings(baseline_of(BASE, path="B.java"), BASE), new_findings(None, BASE))
+
+    def test_save_and_load(self):
+        path = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+
+        baseline_of(BASE).save(path)
+
+        self.assertEqual(new_findings(Baseline.load(path), BASE), [])
+
+
+class BaseRevisionTest(unittest.TestCase):
+    """Base findings come from the merge base, not the tip of the base branch"""
+
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo)
+        git(self.repo, "init", "-q", "-b", "base")
+        write(self.repo, "A.java", BASE)
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "base")
+        git(self.repo, "checkout", "-q", "-b", "head")
+        write(self.repo, "A.java", BASE.replace("void run() {}", "void run() { }"))
+        git(self.repo, "commit", "-q", "-am", "head")
+        # The base branch fixes the violation after head branched off
+        git(self.repo, "checkout", "-q", "base")
+        write(self.repo, "A.java", BASE.replace("int a=1;", "int a = 1;"))
+        git(self.repo, "commit", "-q", "-am", "fix on base")
+
+    def base_findings(self, base_rev: str) -> list[tuple[str, int]]:
+        baseline = Baseline()
+        with GitBlobReader(cwd=self.repo) as reader:
+            head = reader.read("head", "A.java")
+            add_base_findings(baseline, ChangedFile("A.java", "M"), reader, load_static_rules(), base_rev)
+        return new_findings(baseline, head)
+
+    def test_merge_base_keeps_pre_existing_findings_quiet(self):
+        self.assertEqual(self.base_findings(merge_base("base", "head", cwd=self.repo)), [])
+
+    def test_base_tip_would_report_them_as_new(self):
+        self.assertNotEqual(self.base_findings("base"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
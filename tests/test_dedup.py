@@ -0,0 +1,100 @@
+"""
+Tests for merging same-line findings by rule family and collapsing runs.
+"""
+
+import unittest
+
+from src.reviewer.dedup import aggregate_comments, build_families
+from src.reviewer.models import Severity, Source, StyleComment
+from src.rules.rule_definitions import Rule
+
+
+def comment(line, rule_id="R", message="m", severity=Severity.MINOR, source=Source.STATIC, path="A.java",
+            position=0, end_line=None):
+    return StyleComment(path, line, position, rule_id, message, severity, source, end_line)
+
+
+def rule(rule_id, family=None):
+    return Rule(rule_id, "", "", Severity.MINOR, "", family=family)
+
+
+FAMILIES = build_families([
+    rule("JAVA_BOOLEAN_NAMING", "boolean_naming"),
+    rule("LLM_BOOLEAN_SEMANTICS", "boolean_naming"),
+    rule("JAVA_OPERATOR_SPACING"),
+])
+
+
+class FamilyMergeTest(unittest.TestCase):
+    def test_same_family_same_line_is_merged(self):
+        result = aggregate_comments([
+            comment(3, "LLM_BOOLEAN_SEMANTICS", "Unclear flag", Severity.MAJOR, Source.LLM),
+            comment(3, "JAVA_BOOLEAN_NAMING", "Use is/has prefix"),
+        ], FAMILIES)
+
+        self.assertEqual(len(result), 1)
+        # Most severe rule wins; the other message is folded in
+        self.assertEqual(result[0].rule_id, "LLM_BOOLEAN_SEMANTICS")
+        self.assertEqual(result[0].message, "Unclear flag Also: Use is/has prefix")
+
+    def test_static_wins_ties(self):
+        result = aggregate_comments([
+            comment(3, "LLM_BOOLEAN_SEMANTICS", "Unclear flag", source=Source.LLM),
+            comment(3, "JAVA_BOOLEAN_NAMING", "Use is/has prefix"),
+        ], FAMILIES)
+
+        self.assertEqual([c.rule_id for c in result], ["JAVA_BOOLEAN_NAMING"])
+
+    def test_different_family_or_line_is_kept(self):
+        result = aggregate_comments([
+            comment(3, "JAVA_BOOLEAN_NAMING"),
+            comment(3, "JAVA_OPERATOR_SPACING"),
+            comment(5, "LLM_BOOLEAN_SEMANTICS", source=Source.LLM),
+            comment(3, "JAVA_BOOLEAN_NAMING", path="B.java"),
+        ], FAMILIES)
+
+        self.assertEqual(len(result), 4)
+
+    def test_duplicate_messages_are_folded_once(self):
+        result = aggregate_comments([
+            comment(3, "JAVA_BOOLEAN_NAMING", "same"),
+            comment(3, "LLM_BOOLEAN_SEMANTICS", "same", source=Source.LLM),
+        ], FAMILIES)
+
+        self.assertEqual(result[0].message, "same")
+
+
+class CollapseRunsTest(unittest.TestCase):
+    def test_contiguous_lines_collapse(self):
+        result = aggregate_comments([comment(4), comment(2), comment(3), comment(7)], FAMILIES)
+
+        self.assertEqual([(c.line_number, c.end_line) for c in result], [(2, 4), (7, None)])
+
+    def test_run_keeps_highest_severity(self):
+        result = aggregate_comments([comment(2), comment(3, severity=Severity.MAJOR)], FAMILIES)
+
+        self.assertEqual(result[0].severity, Severity.MAJOR)
+
+    def test_different_message_source_or_file_do_not_collapse(self):
+        result = aggregate_comments([
+            comment(2, message="a"),
+            comment(3, message="b"),
+            comment(4, message="b", source=Source.LLM),
+            comment(5, message="b", path="B.java"),
+        ], FAMILIES)
+
+        self.assertTrue(all(c.end_line is None for c in result))
+
+    def test_existing_ranges_extend(self):
+        result = aggregate_comments([comment(2, end_line=4), comment(5), comment(3)], FAMILIES)
+
+        self.assertEqual([(c.line_number, c.end_line) for c in result], [(2, 5)])
+
+    def test_output_is_ordered(self):
+        result = aggregate_comments([comment(9, path="B.java"), comment(5, "Z"), comment(5, "A")], FAMILIES)
+
+        self.assertEqual([(c.file_path, c.rule_id) for c in result], [("A.java", "A"), ("A.java", "Z"), ("B.java", "R")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Tests for git object-level source access against a throwaway repository.
+
+The fixture repository has a base branch and a head branch that modifies,
+renames, deletes and adds files, including a path with a space. The base
+branch moves on after head branches off.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from src.reviewer.git_source import (
+    GitBlobReader,
+    blob_sizes,
+    change_sizes,
+    clamp_to_hunk,
+    diff_line_ranges,
+    list_changed_files,
+    merge_base,
+    parse_hunk_ranges,
+    staged_line_ranges,
+)
+
+# Large enough that git detects the rename despite a one-line edit
+RENAMED_BODY = "".join(f"    int field{i} = {i};\n" for i in range(20))
+
+
+def git(cwd, *args):
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="Test", GIT_AUTHOR_EMAIL="test@example.com",
+        GIT_COMMITTER_NAME="Test", GIT_COMMITTER_EMAIL="test@example.com",
+        GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_NOSYSTEM="1",
+    )
+    return subprocess.run(["git", *args], cwd=cwd, env=env, capture_output=True, check=True)
+
+
+def write(root, path, content):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+
+class GitSourceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = tempfile.mkdtemp()
+        git(cls.repo, "init", "-q", "-b", "base")
+        write(cls.repo, "src/Modified.java", "class Modified {\n    int a;\n}\n")
+        write(cls.repo, "src/Old.java", "class Old {\n" + RENAMED_BODY + "}\n")
+        write(cls.repo, "src/Deleted.java", "class Deleted {}\n")
+        git(cls.repo, "add", "-A")
+        git(cls.repo, "commit", "-q", "-m", "base")
+
+        git(cls.repo, "checkout", "-q", "-b", "head")
+        write(cls.repo, "src/Modified.java", "class Modified {\n    int a;\n    int b;\n}\n")
+        git(cls.repo, "mv", "src/Old.java", "src/New.java")
+        write(cls.repo, "src/New.java", "class New {\n" + RENAMED_BODY + "}\n")
+        git(cls.repo, "rm", "-q", "src/Deleted.java")
+        write(cls.repo, "src/With Space.java", "class WithSpace {}\n")
+        git(cls.repo, "add", "-A")
+        git(cls.repo, "commit", "-q", "-m", "head")
+
+        git(cls.repo, "checkout", "-q", "base")
+        write(cls.repo, "src/Modified.java", "class Modified {\n    int fixed;\n}\n")
+        git(cls.repo, "commit", "-q", "-am", "fix on base")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.repo)
+
+    def test_list_changed_files(self):
+        changes = {c.path: c for c in list_changed_files("base", "head", cwd=self.repo)}
+
+        self.assertEqual(set(changes), {"src/Modified.java", "src/New.java", "src/Deleted.java", "src/With Space.java"})
+        self.assertEqual(changes["src/Modified.java"].status, "M")
+        self.assertEqual(changes["src/Deleted.java"].status, "D")
+        self.assertEqual(changes["src/With Space.java"].status, "A")
+        self.assertEqual(changes["src/New.java"].status, "R")
+        self.assertEqual(changes["src/New.java"].base_path, "src/Old.java")
+        self.assertEqual(changes["src/Modified.java"].base_path, "src/Modified.java")
+
+    def test_read(self):
+        with GitBlobReader(cwd=self.repo) as reader:
+            self.assertEqual(reader.read("base", "src/Deleted.java"), "class Deleted {}\n")
+            self.assertEqual(reader.read("head", "src/With Space.java"), "class WithSpace {}\n")
+            self.assertEqual(reader.read("head", "src/Old.java", max_bytes=5), None)
+            self.assertEqual(reader.read("head~1", "src/Modified.java", max_bytes=5), "class")
+            # Missing paths, trees and unknown revisions all read as None
+            self.assertIsNone(reader.read("head", "src/Deleted.java"))
+            self.assertIsNone(reader.read("head", "src"))
+            self.assertIsNone(reader.read("no-such-branch", "src/Modified.java"))
+            # The process is still usable after missing objects
+            self.assertTrue(reader.read("head", "src/New.java").startswith("class New {"))
+
+    def test_read_many(self):
+        items = [
+            ("head", "src/Modified.java"),
+            ("head~1", "src/Modified.java"),
+            ("head", "src/Deleted.java"),
+            ("base", "src/Old.java"),
+            ("head", "src/With Space.java"),
+            ("base", "src/With Space.java"),
+        ]
+        with GitBlobReader(cwd=self.repo) as reader:
+            blobs = reader.read_many(items)
+
+        self.assertEqual(blobs[0], "class Modified {\n    int a;\n    int b;\n}\n")
+        self.assertEqual(blobs[1], "class Modified {\n    int a;\n}\n")
+        self.assertIsNone(blobs[2])
+        self.assertEqual(blobs[3], "class Old {\n" + RENAMED_BODY + "}\n")
+        self.assertEqual(blobs[4], "class WithSpace {}\n")
+        self.assertIsNone(blobs[5])
+
+    def test_read_many_large_batch(self):
+        # More requests than fit in a pipe buffer at once must not deadlock
+        items = [("head", "src/New.java"), ("head", "src/Missing.java")] * 2000
+        with GitBlobReader(cwd=self.repo) as reader:
+            blobs = reader.read_many(items, max_bytes=9)
+
+        self.assertEqual(blobs[::2], ["class New"] * 2000)
+        self.assertEqual(blobs[1::2], [None] * 2000)
+
+    def test_merge_base(self):
+        fork = merge_base("base", "head", cwd=self.repo)
+
+        self.assertEqual(fork, git(self.repo, "rev-parse", "head~1").stdout.decode().strip())
+        with GitBlobReader(cwd=self.repo) as reader:
+            self.assertEqual(reader.read(fork, "src/Modified.java"), "class Modified {\n    int a;\n}\n")
+            self.assertEqual(reader.read("base", "src/Modified.java"), "class Modified {\n    int fixed;\n}\n")
+
+    def test_change_sizes(self):
+        sizes = change_sizes("base", "head", cwd=self.repo)
+
+        # Renames are keyed by the new path
+        self.assertEqual(sizes["src/New.java"], 2)
+        self.assertNotIn("src/Old.java", sizes)
+        self.assertEqual(sizes["src/Modified.java"], 1)
+        self.assertEqual(sizes["src/Deleted.java"], 1)
+        self.assertEqual(sizes["src/With Space.java"], 1)
+
+    def test_blob_sizes(self):
+        sizes = blob_sizes("head", ["src/With Space.java", "src/Deleted.java"], cwd=self.repo)
+
+        self.assertEqual(sizes, {"src/With Space.java": len("class WithSpace {}\n")})
+
+    def test_diff_line_ranges(self):
+        ranges = diff_line_ranges("base", "head", cwd=self.repo)
+
+        # New side of each hunk, context lines included
+        self.assertEqual(ranges["src/Modified.java"], [(1, 4)])
+        self.assertEqual(ranges["src/With Space.java"], [(1, 1)])
+        self.assertNotIn("src/Deleted.java", ranges)
+
+
+class StagedRangeTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo)
+        git(self.repo, "init", "-q")
+        write(self.repo, "A.java", "".join(f"line{i}\n" for i in range(1, 11)))
+        write(self.repo, "Trimmed.java", "a\nb\nc\n")
+        write(self.repo, "Deleted.java", "class Deleted {}\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "base")
+
+    def test_staged_line_ranges(self):
+        # Added lines starting with "++ " or "-- " look like file headers in the diff
+        lines = [f"line{i}\n" for i in range(1, 11)]
+        lines[2:2] = ["++ i;\n", "-- j;\n"]
+        lines[9] = "changed\n"
+        write(self.repo, "A.java", "".join(lines))
+        write(self.repo, "Trimmed.java", "a\nc\n")
+        write(self.repo, "New File.java", "class New {}\n")
+        write(self.repo, "Unstaged.java", "class Unstaged {}\n")
+        git(self.repo, "add", "A.java", "Trimmed.java", "New File.java")
+        git(self.repo, "rm", "-q", "Deleted.java")
+
+        ranges = staged_line_ranges(cwd=self.repo)
+
+        self.assertEqual(ranges, {"A.java": [(3, 4), (10, 10)], "Trimmed.java": [], "New File.java": [(1, 1)]})
+
+    def test_nothing_staged(self):
+        write(self.repo, "A.java", "unstaged\n")
+
+        self.assertEqual(staged_line_ranges(cwd=self.repo), {})
+
+
+class HunkRangeTest(unittest.TestCase):
+    def test_parse_hunk_ranges(self):
+        diff = "\n".join([
+            "diff --git src/A.java src/A.java",
+            "--- src/A.java",
+            "+++ src/A.java",
+            "@@ -1,2 +1,3 @@",
+            " a",
+            "+++ i;",
+            "+-- j;",
+            "@@ -10 +11,0 @@",
+            "-gone",
+            "@@ -20 +20 @@",
+            "-x",
+            "+y",
+            "diff --git src/Gone.java src/Gone.java",
+            "--- src/Gone.java",
+            "+++ /dev/null",
+            "@@ -1 +0,0 @@",
+            "-z",
+            "diff --git src/B C.java src/B C.java",
+            "--- /dev/null",
+            "+++ src/B C.java\t",
+            "@@ -0,0 +1,2 @@",
+        ])
+
+        self.assertEqual(parse_hunk_ranges(diff), {"src/A.java": [(1, 3), (20, 20)], "src/B C.java": [(1, 2)]})
+
+    def test_clamp_to_hunk(self):
+        hunks = [(5, 12), (20, 30)]
+
+        self.assertEqual(clamp_to_hunk(6, 9, hunks), (6, 9))
+        # Start before the hunk holding the end line
+        self.assertEqual(clamp_to_hunk(2, 8, hunks), (5, 8))
+        # Spans two hunks: kept within the one holding the end line
+        self.assertEqual(clamp_to_hunk(10, 25, hunks), (20, 25))
+        # End outside any hunk: cut at the end of the start's hunk
+        self.assertEqual(clamp_to_hunk(10, 15, hunks), (10, 12))
+        # Neither end in a hunk, or no hunks at all: a single line
+        self.assertEqual(clamp_to_hunk(13, 15, hunks), (13, 13))
+        self.assertEqual(clamp_to_hunk(3, 8, []), (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
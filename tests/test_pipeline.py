@@ -0,0 +1,66 @@
+"""
+Tests for the review pipeline: static check reuse, line range filtering
+and aggregation of findings.
+"""
+
+import unittest
+from unittest import mock
+
+from src.reviewer import pipeline
+from src.reviewer.models import Severity, StyleComment
+
+CODE = "public class A {\n    int a=1;\n    int b=2;\n    int c=3;\n}\n"
+
+
+def static_review(code: str = CODE, **kwargs) -> list[StyleComment]:
+    return pipeline.run_reviewer("A.java", code, enable_llm=False, **kwargs)
+
+
+class StaticFindingsReuseTest(unittest.TestCase):
+    def test_prepass_findings_are_not_recomputed(self):
+        rules = pipeline.load_static_rules()
+        raw = pipeline.check_static_rules("A.java", CODE, rules)
+
+        with mock.patch.object(pipeline, "check_static_rules", side_effect=AssertionError("checkers ran twice")):
+            comments = static_review(static_findings=raw)
+
+        self.assertEqual(comments, static_review())
+
+    def test_prepass_findings_are_capped_and_filtered(self):
+        rules = pipeline.load_static_rules()
+        raw = pipeline.check_static_rules("A.java", CODE, rules)
+
+        capped = pipeline.run_static_checks("A.java", CODE, rules, max_findings_per_rule=1, raw_findings=raw)
+
+        self.assertEqual(capped, pipeline.run_static_checks("A.java", CODE, rules, max_findings_per_rule=1))
+        self.assertEqual(len([c for c in capped if c.rule_id == "JAVA_OPERATOR_SPACING"]), 1)
+
+
+class LineRangeTest(unittest.TestCase):
+    def findings(self, line_ranges, code: str = CODE) -> list[tuple[str, int, int]]:
+        return [(c.rule_id, c.line_number, c.end_line) for c in static_review(code, line_ranges=line_ranges)]
+
+    def test_all_lines_collapse_into_one_run(self):
+        self.assertIn(("JAVA_OPERATOR_SPACING", 2, 4), self.findings(None))
+
+    def test_findings_outside_ranges_are_dropped_before_collapsing(self):
+        # Lines 2 and 4 are not in range, so the run is not widened to them
+        self.assertEqual(self.findings([(3, 3)]), [("JAVA_OPERATOR_SPACING", 3, None)])
+        self.assertEqual(self.findings([(1, 2), (4, 9)]), [
+            ("JAVA_OPERATOR_SPACING", 2, None),
+            ("JAVA_OPERATOR_SPACING", 4, None),
+        ])
+
+    def test_no_ranges_leaves_no_findings(self):
+        self.assertEqual(self.findings([]), [("NO_ISSUES", 1, None)])
+
+    def test_end_of_file_findings_count_as_the_last_line(self):
+        # The missing final newline is reported past the last of the 5 lines
+        code = CODE.rstrip("\n")
+        eof = ("JAVA_FILE_END_NEWLINE", 6, None)
+
+        self.assertIn(eof, self.findings([(5, 5)], code))
+        self.assertNotIn(eof, self.findings([(1, 4)], code))
+
+if __name__ == "__main__":
+    unittest.main()
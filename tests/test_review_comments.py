@@ -0,0 +1,48 @@
+"""
+Tests for turning findings into GitHub review comments.
+"""
+
+import unittest
+
+from scripts.run import github_review_comment
+from src.reviewer.models import Severity, StyleComment
+
+
+def comment(line, end_line=None, path="A.java"):
+    return StyleComment(path, line, 0, "R", "m", Severity.MINOR, end_line=end_line)
+
+
+class GithubReviewCommentTest(unittest.TestCase):
+    def test_single_line(self):
+        result = github_review_comment(comment(4), {"A.java": [(1, 10)]})
+
+        self.assertEqual((result["path"], result["line"], result["side"]), ("A.java", 4, "RIGHT"))
+        self.assertNotIn("start_line", result)
+
+    def test_range_inside_hunk(self):
+        result = github_review_comment(comment(3, 6), {"A.java": [(1, 10)]})
+
+        self.assertEqual((result["start_line"], result["line"], result["start_side"]), (3, 6, "RIGHT"))
+        self.assertIn("**Lines:** 3-6", result["body"])
+
+    def test_range_is_clamped_to_one_hunk(self):
+        result = github_review_comment(comment(3, 25), {"A.java": [(1, 10), (20, 30)]})
+
+        self.assertEqual((result["start_line"], result["line"]), (20, 25))
+        # The body still names the whole run
+        self.assertIn("**Lines:** 3-25", result["body"])
+
+    def test_range_without_diff_ranges_is_single_line(self):
+        for ranges in (None, {}, {"A.java": [(40, 50)]}):
+            result = github_review_comment(comment(3, 6), ranges)
+
+            self.assertEqual(result["line"], 3)
+            self.assertNotIn("start_line", result)
+            self.assertIn("**Lines:** 3-6", result["body"])
+
+    def test_line_zero_becomes_one(self):
+        self.assertEqual(github_review_comment(comment(0))["line"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
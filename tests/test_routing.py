@@ -0,0 +1,214 @@
+"""
+Tests for routing requests across LLM backends, against in-process stub
+OpenAI-compatible servers (scripts/stub_llm_server.py).
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+
+from scripts.stub_llm_server import make_handler
+from src.llm.config import load_config
+from src.llm.providers import RoutingProvider
+from src.reviewer import pipeline
+
+SMALL_FILE = "class A {}\n"
+LARGE_FILE = "class A {\n" + "    int x;\n" * 20 + "}\n"
+
+
+class StubServer:
+    """A stub LLM server on a free port, counting the requests it answers"""
+
+    def __init__(self, status=200, latency=0.0, retry_after=None, reply=None):
+        self.args = SimpleNamespace(port=0, status=status, latency=latency, retry_after=retry_after, reply=reply)
+        self.requests = 0
+        stub = self
+
+        class Handler(make_handler(self.args)):
+            def do_POST(self):
+                stub.requests += 1
+                super().do_POST()
+
+            def log_message(self, format, *log_args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.args.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.args.port}/v1"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class RoutingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        # Keep the developer's provider overrides out of the fixture config
+        env = {k: v for k, v in os.environ.items() if not k.startswith(("LLM_", "ROUTER_", "PRIMARY_", "LOCAL_"))}
+        patcher = mock.patch.dict(os.environ, env, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stub(self, **kwargs) -> StubServer:
+        server = StubServer(**kwargs)
+        self.addCleanup(server.close)
+        return server
+
+    def write_config(self, primary: StubServer, fallback: StubServer = None, primary_concurrency: int = 4,
+                     queue_timeout: float = 5.0, throttle_cooldown: float = 30.0) -> str:
+        lines = [
+            "provider: router",
+            "router:",
+            "  routes:",
+            "    - backend: primary",
+            f"  fallback: {'local' if fallback else ''}",
+            f"  queue_timeout: {queue_timeout}",
+            f"  throttle_cooldown: {throttle_cooldown}",
+            "primary:",
+            "  type: openai",
+            "  model: primary-model",
+            f"  base_url: {primary.base_url}",
+            f"  max_concurrency: {primary_concurrency}",
+        ]
+        if fallback:
+            lines += ["local:", "  type: openai", "  model: local-model", f"  base_url: {fallback.base_url}"]
+        path = os.path.join(self.directory, "config.yaml")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def provider(self, *args, **kwargs) -> RoutingProvider:
+        return RoutingProvider(load_config(self.write_config(*args, **kwargs)))
+
+
+class RouteTest(RoutingTestCase):
+    def test_route_by_size_and_complexity(self):
+        path = os.path.join(self.directory, "config.yaml")
+        with open(path, "w") as f:
+            f.write(
+                "provider: router\n"
+                "router:\n"
+                "  routes:\n"
+                "    - {backend: small, max_lines: 5, max_complexity: 2}\n"
+                "    - {backend: medium, max_lines: 50}\n"
+                "    - {backend: large}\n"
+                "small: {type: openai, model: s, base_url: http://127.0.0.1:9/v1}\n"
+                "medium: {type: openai, model: m, base_url: http://127.0.0.1:9/v1}\n"
+                "large: {type: openai, model: l, base_url: http://127.0.0.1:9/v1}\n"
+            )
+        provider = RoutingProvider(load_config(path))
+        branchy = "void f() {\n    if (a) {}\n    while (b) {}\n    for (;;) {}\n}\n"
+
+        self.assertEqual(provider.route(SMALL_FILE), "small")
+        # Short enough for the first route, but too many branches
+        self.assertEqual(provider.route(branchy), "medium")
+        self.assertEqual(provider.route(LARGE_FILE), "medium")
+        self.assertEqual(provider.route("x\n" * 51), "large")
+
+
+class FallbackTest(RoutingTestCase):
+    def test_throttled_backend_falls_back_and_cools_down(self):
+        primary = self.stub(status=429, retry_after=60)
+        local = self.stub(reply="from local")
+        provider = self.provider(primary, local)
+
+        self.assertEqual(provider.call("prompt", SMALL_FILE), "from local")
+        # Within Retry-After the throttled backend is not even tried
+        self.assertEqual(provider.call("prompt", SMALL_FILE), "from local")
+
+        self.assertEqual(primary.requests, 1)
+        self.assertEqual(local.requests, 2)
+        stats = provider.backends["primary"].stats
+        self.assertEqual((stats.calls, stats.failures, stats.throttled), (0, 1, 1))
+        self.assertEqual(provider.backends["local"].stats.fallback_calls, 2)
+
+    def test_cooldown_expires(self):
+        primary = self.stub(status=429)
+        local = self.stub(reply="from local")
+        provider = self.provider(primary, local, throttle_cooldown=0.05)
+
+        provider.call("prompt", SMALL_FILE)
+        time.sleep(0.1)
+        primary.args.status = 200
+        primary.args.reply = "from primary"
+
+        self.assertEqual(provider.call("prompt", SMALL_FILE), "from primary")
+        self.assertEqual(primary.requests, 2)
+
+    def test_server_error_falls_back(self):
+        provider = self.provider(self.stub(status=503), self.stub(reply="from local"))
+
+        self.assertEqual(provider.call("prompt", SMALL_FILE), "from local")
+        self.assertFalse(provider.backends["primary"].is_throttled())
+
+    def test_saturated_backend_falls_back(self):
+        primary = self.stub(latency=0.5, reply="from primary")
+        local = self.stub(reply="from local")
+        provider = self.provider(primary, local, primary_concurrency=1, queue_timeout=0.05)
+
+        busy = threading.Thread(target=provider.call, args=("prompt", SMALL_FILE))
+        busy.start()
+        while provider.backends["primary"].in_flight == 0:
+            time.sleep(0.01)
+
+        self.assertEqual(provider.call("prompt", SMALL_FILE), "from local")
+        busy.join()
+        self.assertEqual(primary.requests, 1)
+        self.assertEqual(provider.backends["primary"].stats.peak_in_flight, 1)
+
+    def test_bad_request_does_not_fall_back(self):
+        for status in (400, 404):
+            local = self.stub(reply="from local")
+            provider = self.provider(self.stub(status=status), local)
+
+            with self.assertRaises(requests.HTTPError):
+                provider.call("prompt", SMALL_FILE)
+            self.assertEqual(local.requests, 0, status)
+            self.assertFalse(provider.backends["primary"].is_throttled())
+
+
+class UsageReportTest(RoutingTestCase):
+    def test_llm_usage_report_counts_calls(self):
+        primary = self.stub(status=429, retry_after=60)
+        local = self.stub()
+        config_path = self.write_config(primary, local)
+
+        with mock.patch.dict(pipeline._llm_clients, clear=True):
+            client = pipeline.get_llm_client(config_path)
+            client.review("prompt", SMALL_FILE)
+            client.review("prompt", SMALL_FILE)
+            report = pipeline.llm_usage_report()
+
+        self.assertEqual(len(report), 2)
+        self.assertTrue(report[0].startswith("primary: 0 call(s) (0 as fallback)"), report[0])
+        self.assertTrue(report[0].endswith("1 failure(s), 1 throttled"), report[0])
+        self.assertTrue(report[1].startswith("local: 2 call(s) (2 as fallback)"), report[1])
+        self.assertIn("0 failure(s), 0 throttled", report[1])
+
+    def test_single_provider_has_no_report(self):
+        path = os.path.join(self.directory, "config.yaml")
+        with open(path, "w") as f:
+            f.write("provider: openai\nopenai: {model: m, base_url: http://127.0.0.1:9/v1}\n")
+
+        with mock.patch.dict(pipeline._llm_clients, clear=True):
+            pipeline.get_llm_client(path)
+            self.assertEqual(pipeline.llm_usage_report(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
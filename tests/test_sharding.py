@@ -0,0 +1,134 @@
+"""
+Tests for splitting a review across shards and merging the shard files.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from src.reviewer.exporters import JsonLinesWriter
+from src.reviewer.models import Severity, StyleComment
+from src.reviewer.sharding import (
+    FILE_OVERHEAD_BYTES,
+    ShardFileError,
+    file_weights,
+    merge_shard_comments,
+    partition,
+    shard_output_path,
+)
+
+
+def comment(path, line=1, rule_id="R", message="m"):
+    return StyleComment(path, line, 0, rule_id, message, Severity.MINOR)
+
+
+def no_issues(path):
+    return comment(path, 0, "NO_ISSUES", "No issues found")
+
+
+class PartitionTest(unittest.TestCase):
+    def test_largest_first_onto_least_loaded(self):
+        shards = partition({"a": 10, "b": 9, "c": 8, "d": 1}, 2)
+
+        self.assertEqual(shards, [["a", "d"], ["b", "c"]])
+
+    def test_every_shard_count_is_deterministic_and_balanced(self):
+        rng = random.Random(7)
+        sizes = {f"src/F{i}.java": rng.randint(0, 50_000) for i in range(40)}
+        weights = file_weights(sizes)
+
+        for shard_count in range(1, 9):
+            shards = partition(weights, shard_count)
+            shuffled = dict(rng.sample(sorted(weights.items()), len(weights)))
+
+            # Every job computes the same split, whatever order it listed files in
+            self.assertEqual(partition(shuffled, shard_count), shards)
+            self.assertEqual(sorted(p for shard in shards for p in shard), sorted(weights))
+            loads = [sum(weights[p] for p in shard) for shard in shards]
+            # LPT: loads differ by at most the largest file
+            self.assertLessEqual(max(loads) - min(loads), max(weights.values()), shard_count)
+
+    def test_ties_break_by_path(self):
+        weights = {"b": 5, "a": 5, "d": 5, "c": 5}
+
+        self.assertEqual(partition(weights, 2), [["a", "c"], ["b", "d"]])
+
+    def test_more_shards_than_files(self):
+        self.assertEqual(partition({"a": 1}, 3), [["a"], [], []])
+
+    def test_invalid_shard_count(self):
+        with self.assertRaises(ValueError):
+            partition({"a": 1}, 0)
+
+    def test_file_weights_include_overhead(self):
+        self.assertEqual(file_weights({"a": 0, "b": 100}), {"a": FILE_OVERHEAD_BYTES, "b": FILE_OVERHEAD_BYTES + 100})
+
+    def test_shard_output_path(self):
+        self.assertEqual(shard_output_path("out/shard-{index}-of-{count}.jsonl", 2, 4), "out/shard-2-of-4.jsonl")
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def shard(self, name, comments):
+        path = os.path.join(self.directory, name)
+        with JsonLinesWriter(path) as writer:
+            for c in comments:
+                writer.write(c)
+        return path
+
+    def test_duplicates_across_shards_are_dropped(self):
+        paths = [
+            self.shard("0.jsonl", [comment("B.java", 3), comment("A.java", 1)]),
+            # A retried shard reviewed B.java again
+            self.shard("1.jsonl", [comment("B.java", 3), comment("B.java", 3, message="other"), comment("C.java")]),
+        ]
+
+        merged = merge_shard_comments(paths)
+
+        self.assertEqual(
+            [(c.file_path, c.line_number, c.message) for c in merged],
+            [("A.java", 1, "m"), ("B.java", 3, "m"), ("B.java", 3, "other"), ("C.java", 1, "m")],
+        )
+
+    def test_no_issues_is_pruned_when_another_shard_found_some(self):
+        paths = [
+            self.shard("0.jsonl", [no_issues("A.java"), no_issues("B.java")]),
+            self.shard("1.jsonl", [comment("A.java", 4)]),
+        ]
+
+        merged = merge_shard_comments(paths)
+
+        self.assertEqual([(c.file_path, c.rule_id) for c in merged], [("A.java", "R"), ("B.java", "NO_ISSUES")])
+
+    def test_empty_shards(self):
+        self.assertEqual(merge_shard_comments([self.shard("0.jsonl", []), self.shard("1.jsonl", [])], 2), [])
+
+    def test_missing_shard_file(self):
+        path = self.shard("0.jsonl", [comment("A.java")])
+
+        with self.assertRaisesRegex(ShardFileError, "1.jsonl"):
+            merge_shard_comments([path, os.path.join(self.directory, "1.jsonl")])
+        with self.assertRaisesRegex(ShardFileError, "Expected 2 shard file"):
+            merge_shard_comments([path], expected_count=2)
+
+    def test_corrupt_shard_file_is_not_partially_merged(self):
+        good = self.shard("0.jsonl", [comment("A.java")])
+        truncated = self.shard("1.jsonl", [comment("B.java"), comment("B.java", 2)])
+        with open(truncated, "r+") as f:
+            f.truncate(len(f.readline()) + 20)
+        wrong_fields = os.path.join(self.directory, "2.jsonl")
+        with open(wrong_fields, "w") as f:
+            f.write('{"path": "C.java"}\n')
+
+        for bad in (truncated, wrong_fields):
+            with self.assertRaisesRegex(ShardFileError, os.path.basename(bad)):
+                merge_shard_comments([good, bad])
+
+
+if __name__ == "__main__":
+    unittest.main()
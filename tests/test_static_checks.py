@@ -0,0 +1,40 @@
+"""
+Tests for the regex based static checks.
+"""
+
+import time
+import unittest
+
+from src.analysis.static_checks import check_multiple_var_declaration
+from src.reviewer.models import Severity
+from src.rules.rule_definitions import Rule
+
+MULTI_VAR_RULE = Rule("JAVA_MULTIPLE_VAR_DECL", "", "variable", Severity.MINOR, "")
+
+
+def multi_var_positions(code: str) -> list[tuple[int, int]]:
+    return [(c.line_number, c.position) for c in check_multiple_var_declaration("A.java", code, MULTI_VAR_RULE)]
+
+
+class MultipleVarDeclarationTest(unittest.TestCase):
+    def test_reports_the_first_comma(self):
+        code = "class A {\n    int a = 1, b = 2;\n    String s, t;\n    int c;\n}\n"
+
+        self.assertEqual(multi_var_positions(code), [(2, 14), (3, 13)])
+
+    def test_comma_after_the_statement_is_ignored(self):
+        code = "int a = 1; foo(a, b);\nint b = foo(1, 2);\nint c\n"
+
+        # A comma inside a call initializer is still reported; nothing past ';' is
+        self.assertEqual(multi_var_positions(code), [(2, 14)])
+
+    def test_long_line_does_not_backtrack(self):
+        line = "int " + "a" * 20000 + " " * 20000 + ";"
+
+        start = time.perf_counter()
+        self.assertEqual(multi_var_positions(line), [])
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for parsing structured (JSON mode) LLM review responses.
+"""
+
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from types import SimpleNamespace
+
+from src.llm.llm_reviewer import LLMReviewer
+from src.llm.structured_output import StructuredOutputError, parse_findings
+from src.rules.rule_loader import load_rules
+
+LLM_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src/rules/llm_rules.yaml")
+CODE = "class A {\n    boolean f;\n    void run() {}\n}\n"
+
+
+class FakeClient:
+    """Returns a canned response instead of calling a provider"""
+
+    def __init__(self, response: str, structured_output: bool = True):
+        self.response = response
+        self.config = SimpleNamespace(structured_output=structured_output)
+        self.requests = []
+
+    def review(self, prompt: str, code: str, json_mode: bool = False) -> str:
+        self.requests.append(json_mode)
+        return self.response
+
+
+def review(response: str):
+    client = FakeClient(response)
+    with redirect_stdout(StringIO()):
+        comments = LLMReviewer(client).review("A.java", CODE, load_rules(LLM_RULES_PATH))
+    return client, comments
+
+
+class ParseFindingsTest(unittest.TestCase):
+    def test_valid_document(self):
+        findings = parse_findings(
+            '{"findings": [{"rule_id": "LLM_BOOLEAN_SEMANTICS", "line": 2, "column": 4, "message": " Unclear "}]}'
+        )
+
+        self.assertEqual(len(findings), 1)
+        self.assertEqual(
+            (findings[0].rule_id, findings[0].line, findings[0].column, findings[0].message),
+            ("LLM_BOOLEAN_SEMANTICS", 2, 4, "Unclear"),
+        )
+
+    def test_bare_list_and_empty(self):
+        self.assertEqual(len(parse_findings('[{"rule_id": "X", "line": 1, "message": "m"}]')), 1)
+        self.assertEqual(parse_findings('{"findings": []}'), [])
+
+    def test_code_fence_is_stripped(self):
+        findings = parse_findings('```json\n{"findings": [{"rule_id": "X", "line": 3, "message": "m"}]}\n```')
+
+        self.assertEqual([f.line for f in findings], [3])
+
+    def test_not_a_findings_document(self):
+        for response in ('{"findings": [{"rule_id": "X", "line": 1', "Line 2: 4: text", '{"issues": []}', "42"):
+            with self.assertRaises(StructuredOutputError, msg=response):
+                parse_findings(response)
+
+    def test_invalid_positions_are_dropped(self):
+        items = [
+            '{"rule_id": "X", "line": 0, "message": "m"}',
+            '{"rule_id": "X", "line": -3, "message": "m"}',
+            '{"rule_id": "X", "line": "2", "message": "m"}',
+            '{"rule_id": "X", "line": 2.0, "message": "m"}',
+            '{"rule_id": "X", "line": true, "message": "m"}',
+            '{"rule_id": "X", "line": 2, "column": -1, "message": "m"}',
+            '{"rule_id": "X", "line": 2, "column": "4", "message": "m"}',
+            '{"rule_id": "", "line": 2, "message": "m"}',
+            '{"rule_id": "X", "line": 2, "message": "  "}',
+            '"not an object"',
+            '{"rule_id": "X", "line": 2, "message": "kept"}',
+        ]
+        findings = parse_findings('{"findings": [' + ", ".join(items) + "]}")
+
+        self.assertEqual([f.message for f in findings], ["kept"])
+
+
+class StructuredReviewTest(unittest.TestCase):
+    def test_known_rule(self):
+        client, comments = review(
+            '{"findings": [{"rule_id": "LLM_BOOLEAN_SEMANTICS", "line": 2, "column": 12, "message": "Unclear flag"}]}'
+        )
+
+        self.assertEqual(client.requests, [True])
+        self.assertEqual([(c.rule_id, c.line_number, c.position) for c in comments], [("LLM_BOOLEAN_SEMANTICS", 2, 12)])
+
+    def test_unknown_rule_is_remapped(self):
+        _, comments = review(
+            '{"findings": [{"rule_id": "MADE_UP", "line": 3, "message": "This method tries to do too much"}]}'
+        )
+
+        self.assertEqual([c.rule_id for c in comments], ["LLM_METHOD_SINGLE_RESPONSIBILITY"])
+
+    def test_line_past_end_of_file_is_dropped(self):
+        _, comments = review(
+            '{"findings": [{"rule_id": "LLM_BOOLEAN_SEMANTICS", "line": 40, "message": "Unclear flag"},'
+            ' {"rule_id": "LLM_BOOLEAN_SEMANTICS", "line": 4, "message": "Unclear flag"}]}'
+        )
+
+        self.assertEqual([c.line_number for c in comments], [4])
+
+    def test_fenced_reply(self):
+        _, comments = review(
+            '```json\n{"findings": [{"rule_id": "LLM_BOOLEAN_SEMANTICS", "line": 2, "message": "Unclear flag"}]}\n```'
+        )
+
+        self.assertEqual([c.line_number for c in comments], [2])
+
+    def test_truncated_reply_falls_back_to_text_parser(self):
+        # Cut off mid-document, but the text lines the model wrote first are still usable
+        _, comments = review("Line 2: 4: Boolean flag name is unclear\n{\"findings\": [{\"rule_id\": ")
+
+        self.assertEqual([(c.rule_id, c.line_number, c.position) for c in comments], [("LLM_BOOLEAN_SEMANTICS", 2, 4)])
+
+    def test_no_findings(self):
+        _, comments = review('{"findings": []}')
+
+        self.assertEqual(comments, [])
+
+
+if __name__ == "__main__":
+    unittest.main()